@@ -19,6 +19,6 @@ The software is distributed under an MIT licence. See LICENSE.txt.
 
 import sys
 
-from libfuturize.main import main
+from libfuturize.client import futurize
 
-sys.exit(main())
+sys.exit(futurize())
@@ -18,6 +18,6 @@ The software is distributed under an MIT licence. See LICENSE.txt.
 
 import sys
 
-from libpasteurize.main import main
+from libfuturize.client import pasteurize
 
-sys.exit(main())
+sys.exit(pasteurize())
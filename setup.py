@@ -170,8 +170,8 @@ setup(name=NAME,
       keywords=KEYWORDS,
       entry_points={
           'console_scripts': [
-              'futurize = libfuturize.main:main',
-              'pasteurize = libpasteurize.main:main'
+              'futurize = libfuturize.client:futurize',
+              'pasteurize = libfuturize.client:pasteurize'
           ]
       },
       package_dir={'': 'src'},
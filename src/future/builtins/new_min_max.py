@@ -10,11 +10,21 @@ _SENTINEL = object()
 
 
 def newmin(*args, **kwargs):
-    return new_min_max(_builtin_min, *args, **kwargs)
+    if not kwargs:
+        return _builtin_min(*args)
+    if 'default' not in kwargs and kwargs.get('key', _SENTINEL) is not None:
+        # The builtin handles everything else, including bad arguments
+        return _builtin_min(*args, **kwargs)
+    return _new_min_max(_builtin_min, args, kwargs)
 
 
 def newmax(*args, **kwargs):
-    return new_min_max(_builtin_max, *args, **kwargs)
+    if not kwargs:
+        return _builtin_max(*args)
+    if 'default' not in kwargs and kwargs.get('key', _SENTINEL) is not None:
+        # The builtin handles everything else, including bad arguments
+        return _builtin_max(*args, **kwargs)
+    return _new_min_max(_builtin_max, args, kwargs)
 
 
 def new_min_max(_builtin_func, *args, **kwargs):
@@ -25,35 +35,31 @@ def new_min_max(_builtin_func, *args, **kwargs):
     :param kwargs:
     :return: returns the min or max based on the arguments passed
     """
+    return _new_min_max(_builtin_func, args, kwargs)
 
-    for key, _ in kwargs.items():
-        if key not in set(['key', 'default']):
-            raise TypeError('Illegal argument %s', key)
 
-    if len(args) == 0:
-        raise TypeError
+def _new_min_max(_builtin_func, args, kwargs):
+    # kwargs is a fresh dict for each call, so it's safe to pop from it
+    key = kwargs.pop('key', None)
+    default = kwargs.pop('default', _SENTINEL)
+    if kwargs:
+        raise TypeError('Illegal argument %s' % ', '.join(sorted(kwargs)))
+
+    if default is _SENTINEL:
+        # Nothing that the builtin can't handle itself
+        if key is not None:
+            return _builtin_func(*args, key=key)
+        return _builtin_func(*args)
 
-    if len(args) != 1 and kwargs.get('default', _SENTINEL) is not _SENTINEL:
+    if len(args) != 1:
         raise TypeError
 
-    if len(args) == 1:
-        iterator = iter(args[0])
-        try:
-            first = next(iterator)
-        except StopIteration:
-            if kwargs.get('default', _SENTINEL) is not _SENTINEL:
-                return kwargs.get('default')
-            else:
-                raise ValueError('{}() arg is an empty sequence'.format(_builtin_func.__name__))
-        else:
-            iterator = itertools.chain([first], iterator)
-        if kwargs.get('key') is not None:
-            return _builtin_func(iterator, key=kwargs.get('key'))
-        else:
-            return _builtin_func(iterator)
-
-    if len(args) > 1:
-        if kwargs.get('key') is not None:
-            return _builtin_func(args, key=kwargs.get('key'))
-        else:
-            return _builtin_func(args)
+    iterator = iter(args[0])
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return default
+    iterator = itertools.chain([first], iterator)
+    if key is not None:
+        return _builtin_func(iterator, key=key)
+    return _builtin_func(iterator)
@@ -8,6 +8,7 @@ from future.utils import PYPY, PY26, bind_method
 # Use the decimal module for simplicity of implementation (and
 # hopefully correctness).
 from decimal import Decimal, ROUND_HALF_EVEN
+from math import copysign as _copysign
 
 
 def newround(number, ndigits=None):
@@ -30,6 +31,13 @@ def newround(number, ndigits=None):
     if hasattr(number, '__round__'):
         return number.__round__(ndigits)
 
+    if (type(number) is float and -_MAX_FAST_NDIGITS <= ndigits <= _MAX_FAST_NDIGITS
+            and _isfinite(number)):
+        result = _round_float(number, ndigits)
+        if return_int:
+            return int(result)
+        return result
+
     exponent = Decimal('10') ** (-ndigits)
 
     # Work around issue #24: round() breaks on PyPy with NumPy's types
@@ -56,6 +64,69 @@ def newround(number, ndigits=None):
         return float(result)
 
 
+# Limits the size of the integers used by _round_float(). Larger values of
+# ndigits are handled with the decimal module.
+_MAX_FAST_NDIGITS = 22
+
+
+def _isfinite(x):
+    return x - x == 0.0    # False for inf and nan
+
+
+def _round_float(x, ndigits):
+    """
+    Rounds the finite float x to ndigits decimal digits with round-half-even,
+    exactly, using integer arithmetic on the float's exact value. Returns a
+    float.
+    """
+    n, d = abs(x).as_integer_ratio()
+    if ndigits >= 0:
+        scale = 10 ** ndigits
+        q, r = divmod(n * scale, d)
+    else:
+        scale = 10 ** -ndigits
+        q, r = divmod(n, d * scale)
+        d *= scale
+    # Round half to even
+    if 2 * r > d or (2 * r == d and q & 1):
+        q += 1
+    if ndigits >= 0:
+        # True division of integers is correctly rounded
+        result = q / scale
+    else:
+        result = float(q * scale)
+    return _copysign(result, x)
+
+
+def newround_sequence(numbers, ndigits=None):
+    """
+    Rounds each number in the iterable ``numbers`` (e.g. a list, tuple or
+    one-dimensional NumPy array) like ``newround(number, ndigits)`` and
+    returns the results as a list.
+
+    This is faster than calling ``newround()`` on each number, as the checks
+    on ``ndigits`` are done once rather than for every number.
+    """
+    if ndigits is None:
+        digits = 0
+    else:
+        digits = ndigits
+    if not -_MAX_FAST_NDIGITS <= digits <= _MAX_FAST_NDIGITS:
+        return [newround(number, ndigits) for number in numbers]
+    if hasattr(numbers, 'tolist'):
+        # NumPy arrays: converting to a list gives Python floats
+        numbers = numbers.tolist()
+    result = []
+    append = result.append
+    for number in numbers:
+        if type(number) is float and number - number == 0.0:
+            rounded = _round_float(number, digits)
+            append(int(rounded) if ndigits is None else rounded)
+        else:
+            append(newround(number, ndigits))
+    return result
+
+
 ### From Python 2.7's decimal.py. Only needed to support Py2.6:
 
 def from_float_26(f):
@@ -102,4 +173,4 @@ def from_float_26(f):
     return result
 
 
-__all__ = ['newround']
+__all__ = ['newround', 'newround_sequence']
@@ -34,6 +34,7 @@ Excerpts from Ryan's docstring:
 from __future__ import absolute_import
 import sys
 from types import FunctionType
+from weakref import WeakKeyDictionary, ref as ref_type
 
 from future.utils import PY3, PY26
 
@@ -60,11 +61,14 @@ def newsuper(typ=_SENTINEL, type_or_obj=_SENTINEL, framedepth=1):
             raise RuntimeError('super() used in a function with no args')
 
         try:
-            typ = find_owner(type_or_obj, f.f_code)
+            if not isinstance(type_or_obj, type):
+                # An instance, so its own __mro__ lookup would fail anyway
+                raise AttributeError
+            typ = _find_owner_cached(type_or_obj, f.f_code)
         except (AttributeError, RuntimeError, TypeError):
             # see issues #160, #267
             try:
-                typ = find_owner(type_or_obj.__class__, f.f_code)
+                typ = _find_owner_cached(type_or_obj.__class__, f.f_code)
             except AttributeError:
                 raise RuntimeError('super() used with an old-style class')
             except TypeError:
@@ -76,34 +80,80 @@ def newsuper(typ=_SENTINEL, type_or_obj=_SENTINEL, framedepth=1):
     return _builtin_super(typ)
 
 
-def find_owner(cls, code):
-    '''Find the class that owns the currently-executing method.
+def _unwrap(meth, cls, typ):
+    '''Drill down through any wrappers to the underlying func.
+    This handles e.g. classmethod() and staticmethod().
     '''
+    while not isinstance(meth, FunctionType):
+        if isinstance(meth, property):
+            # Calling __get__ on the property will invoke
+            # user code which might throw exceptions or have
+            # side effects
+            meth = meth.fget
+        else:
+            try:
+                meth = meth.__func__
+            except AttributeError:
+                meth = meth.__get__(cls, typ)
+    return meth
+
+
+def _find_owner_and_name(cls, code):
     for typ in cls.__mro__:
-        for meth in typ.__dict__.values():
-            # Drill down through any wrappers to the underlying func.
-            # This handles e.g. classmethod() and staticmethod().
+        for name, meth in typ.__dict__.items():
             try:
-                while not isinstance(meth,FunctionType):
-                    if isinstance(meth, property):
-                        # Calling __get__ on the property will invoke
-                        # user code which might throw exceptions or have
-                        # side effects
-                        meth = meth.fget
-                    else:
-                        try:
-                            meth = meth.__func__
-                        except AttributeError:
-                            meth = meth.__get__(cls, typ)
+                meth = _unwrap(meth, cls, typ)
             except (AttributeError, TypeError):
                 continue
-            if meth.func_code is code:
-                return typ   # Aha!  Found you.
+            if meth.__code__ is code:
+                return typ, name   # Aha!  Found you.
         #  Not found! Move onto the next class in MRO.
 
     raise TypeError
 
 
+def find_owner(cls, code):
+    '''Find the class that owns the currently-executing method.
+    '''
+    return _find_owner_and_name(cls, code)[0]
+
+
+# Maps each class to a dict mapping the code objects of methods called on it
+# to (ref, name): a weak reference to the class in its MRO that holds the
+# method, and the attribute name under which it was found. The values must
+# not refer to the key class strongly, or it would never be collected.
+_owner_cache = WeakKeyDictionary()
+
+
+def _find_owner_cached(cls, code):
+    '''Like find_owner(), but remembers the result for each class and code
+    object. A remembered owner is used only while it is still in the class's
+    MRO and still holds the method under the same name.
+    '''
+    try:
+        ref, name = _owner_cache[cls][code]
+    except (KeyError, TypeError):
+        pass
+    else:
+        owner = ref()
+        try:
+            meth = owner.__dict__[name]
+            if not isinstance(meth, FunctionType):
+                meth = _unwrap(meth, cls, owner)
+            if meth.__code__ is code and owner in cls.__mro__:
+                return owner
+        except (AttributeError, KeyError, TypeError):
+            pass
+    owner, name = _find_owner_and_name(cls, code)
+    try:
+        codes = _owner_cache.setdefault(cls, {})
+        codes[code] = (ref_type(owner), name)
+    except TypeError:
+        # cls or owner can't be weakly referenced
+        pass
+    return owner
+
+
 def superm(*args, **kwds):
     f = sys._getframe(1)
     nm = f.f_code.co_name
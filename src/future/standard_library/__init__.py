@@ -71,6 +71,7 @@ else:
 import contextlib
 import copy
 import os
+import types
 
 # Make a dedicated logger; leave the root logger to be configured
 # by the application.
@@ -259,17 +260,17 @@ class RenameImport(object):
                 len(set(old_to_new.values())) == len(old_to_new.values())), \
                'Ambiguity in renaming (handler not implemented)'
         self.new_to_old = dict((new, old) for (old, new) in old_to_new.items())
+        # Handles hierarchical importing: package.module.module2
+        self.new_base_names = frozenset(s.split('.')[0]
+                                        for s in self.new_to_old)
 
     def find_module(self, fullname, path=None):
-        # Handles hierarchical importing: package.module.module2
-        new_base_names = set([s.split('.')[0] for s in self.new_to_old])
         # Before v0.12: Was: if fullname in set(self.old_to_new) | new_base_names:
-        if fullname in new_base_names:
+        if fullname in self.new_base_names:
             return self
         return None
 
     def load_module(self, name):
-        path = None
         if name in sys.modules:
             return sys.modules[name]
         elif name in self.new_to_old:
@@ -283,16 +284,25 @@ class RenameImport(object):
         sys.modules[name] = module
         return module
 
-    def _find_and_load_module(self, name, path=None):
+    def _find_and_load_module(self, name):
         """
         Finds and loads it. But if there's a . in the name, handles it
         properly.
+
+        Modules and packages that have already been imported are taken from
+        sys.modules rather than being found and executed again.
         """
+        if name in sys.modules:
+            return sys.modules[name]
+        path = None
         bits = name.split('.')
-        while len(bits) > 1:
-            # Treat the first bit as a package
-            packagename = bits.pop(0)
-            package = self._find_and_load_module(packagename, path)
+        for i in range(len(bits) - 1):
+            # Treat the first bits as packages
+            packagename = '.'.join(bits[:i + 1])
+            package = sys.modules.get(packagename)
+            if package is None:
+                module_info = imp.find_module(bits[i], path)
+                package = imp.load_module(packagename, *module_info)
             try:
                 path = package.__path__
             except AttributeError:
@@ -302,9 +312,8 @@ class RenameImport(object):
                     return sys.modules[name]
                 flog.debug('What to do here?')
 
-        name = bits[0]
-        module_info = imp.find_module(name, path)
-        return imp.load_module(name, *module_info)
+        module_info = imp.find_module(bits[-1], path)
+        return imp.load_module(bits[-1], *module_info)
 
 
 class hooks(object):
@@ -446,10 +455,87 @@ def restore_sys_modules(scrubbed):
     sys.modules.update(scrubbed)
 
 
-def install_aliases():
+class _LazyModule(types.ModuleType):
+    """
+    A stand-in for the module ``target`` that is put in sys.modules under the
+    name ``name``. The target is only imported when an attribute of the
+    stand-in is first looked up. Its contents are then copied into the
+    stand-in, which is replaced by the target in sys.modules and in its
+    parent package.
+    """
+    def __init__(self, name, target):
+        super(_LazyModule, self).__init__(name)
+        self.__dict__['_lazy_target'] = target
+
+    def __getattr__(self, attr):
+        # Only called for attributes that are not in __dict__ yet
+        target = self.__dict__.pop('_lazy_target', None)
+        if target is None:
+            # Already loaded, or being loaded
+            raise AttributeError(attr)
+        name = self.__name__
+        __import__(target)
+        module = sys.modules[target]
+        self.__dict__.update(module.__dict__)
+        if sys.modules.get(name) is self:
+            sys.modules[name] = module
+        parentname, _, childname = name.rpartition('.')
+        parent = sys.modules.get(parentname)
+        if parent is not None and getattr(parent, childname, None) is self:
+            setattr(parent, childname, module)
+        return getattr(module, attr)
+
+
+def _module_exists(name, path=None):
+    """
+    Returns True if a top-level module (or a submodule, given the package
+    ``path``) can be found, without importing it.
+    """
+    try:
+        module_info = imp.find_module(name, path)
+    except ImportError:
+        return False
+    if module_info[0] is not None:
+        module_info[0].close()
+    return True
+
+
+def _alias_module(parent, name, target, lazy):
+    """
+    Makes the module ``target`` available as the submodule ``name`` of the
+    package ``parent``. If ``lazy`` is True, it is imported on first use.
+    """
+    if lazy:
+        module = _LazyModule(name, target)
+    else:
+        __import__(target)
+        module = sys.modules[target]
+    setattr(parent, name.rpartition('.')[2], module)
+    sys.modules[name] = module
+
+
+def _alias_optional_module(parent, name, target, lazy, requires, path=None):
+    """
+    Like _alias_module(), but does nothing if ``target`` cannot be imported
+    because the Py2 module ``requires`` that it wraps is missing.
+    """
+    if not lazy:
+        try:
+            _alias_module(parent, name, target, lazy)
+        except ImportError:
+            pass
+    elif _module_exists(requires, path):
+        _alias_module(parent, name, target, lazy)
+
+
+def install_aliases(lazy=False):
     """
     Monkey-patches the standard library in Py2.6/7 to provide
     aliases for better Py3 compatibility.
+
+    With ``lazy=True``, the submodules added to ``urllib``, ``test`` and
+    ``dbm`` are not imported until they are first used. This avoids importing
+    the whole ``urllib`` backport in programs that never use it.
     """
     if PY3:
         return
@@ -470,34 +556,19 @@ def install_aliases():
 
     # Hack for urllib so it appears to have the same structure on Py2 as on Py3
     import urllib
-    from future.backports.urllib import request
-    from future.backports.urllib import response
-    from future.backports.urllib import parse
-    from future.backports.urllib import error
-    from future.backports.urllib import robotparser
-    urllib.request = request
-    urllib.response = response
-    urllib.parse = parse
-    urllib.error = error
-    urllib.robotparser = robotparser
-    sys.modules['urllib.request'] = request
-    sys.modules['urllib.response'] = response
-    sys.modules['urllib.parse'] = parse
-    sys.modules['urllib.error'] = error
-    sys.modules['urllib.robotparser'] = robotparser
+    for submodule in ['request', 'response', 'parse', 'error', 'robotparser']:
+        _alias_module(urllib, 'urllib.' + submodule,
+                      'future.backports.urllib.' + submodule, lazy)
 
     # Patch the test module so it appears to have the same structure on Py2 as on Py3
     try:
         import test
     except ImportError:
         pass
-    try:
-        from future.moves.test import support
-    except ImportError:
-        pass
     else:
-        test.support = support
-        sys.modules['test.support'] = support
+        _alias_optional_module(test, 'test.support',
+                               'future.moves.test.support', lazy,
+                               'test_support', test.__path__)
 
     # Patch the dbm module so it appears to have the same structure on Py2 as on Py3
     try:
@@ -505,23 +576,11 @@ def install_aliases():
     except ImportError:
         pass
     else:
-        from future.moves.dbm import dumb
-        dbm.dumb = dumb
-        sys.modules['dbm.dumb'] = dumb
-        try:
-            from future.moves.dbm import gnu
-        except ImportError:
-            pass
-        else:
-            dbm.gnu = gnu
-            sys.modules['dbm.gnu'] = gnu
-        try:
-            from future.moves.dbm import ndbm
-        except ImportError:
-            pass
-        else:
-            dbm.ndbm = ndbm
-            sys.modules['dbm.ndbm'] = ndbm
+        _alias_module(dbm, 'dbm.dumb', 'future.moves.dbm.dumb', lazy)
+        _alias_optional_module(dbm, 'dbm.gnu', 'future.moves.dbm.gnu', lazy,
+                               'gdbm')
+        _alias_optional_module(dbm, 'dbm.ndbm', 'future.moves.dbm.ndbm', lazy,
+                               'dbm')
 
     # install_aliases.run_already = True
 
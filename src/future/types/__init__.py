@@ -90,6 +90,7 @@ docstring for more details.
 from __future__ import absolute_import, division, print_function
 
 import functools
+import sys
 from numbers import Integral
 
 from future import utils
@@ -137,34 +138,80 @@ def disallow_types(argnums, disallowed_types):
     """
 
     def decorator(function):
+        checks = [(argnum, _resolve_type(mytype, False))
+                  for (argnum, mytype) in zip(argnums, disallowed_types)]
+        if all(mytype is not None for (argnum, mytype) in checks):
+            return _make_type_checker(function, checks)
+
+        # A type given by name isn't defined yet. Look it up on the first
+        # call, to prevent circular imports.
+        checker = []
 
         @functools.wraps(function)
         def wrapper(*args, **kwargs):
-            # These imports are just for this decorator, and are defined here
-            # to prevent circular imports:
-            from .newbytes import newbytes
-            from .newint import newint
-            from .newstr import newstr
-
-            errmsg = "argument can't be {0}"
-            for (argnum, mytype) in zip(argnums, disallowed_types):
-                # Handle the case where the type is passed as a string like 'newbytes'.
-                if isinstance(mytype, str) or isinstance(mytype, bytes):
-                    mytype = locals()[mytype]
-
-                # Only restrict kw args only if they are passed:
-                if len(args) <= argnum:
-                    break
-
-                # Here we use type() rather than isinstance() because
-                # __instancecheck__ is being overridden. E.g.
-                # isinstance(b'abc', newbytes) is True on Py2.
-                if type(args[argnum]) == mytype:
-                    raise TypeError(errmsg.format(mytype))
+            if not checker:
+                checker.append(_make_type_checker(function, [
+                    (argnum, _resolve_type(mytype, True))
+                    for (argnum, mytype) in zip(argnums, disallowed_types)]))
+            return checker[0](*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _resolve_type(mytype, import_module):
+    """
+    Returns the type ``mytype``, which may also be given as the name of one
+    of the types in this package, like 'newbytes'. Returns None if the
+    type's module hasn't been imported yet, unless ``import_module`` is
+    True.
+    """
+    # Handle the case where the type is passed as a string like 'newbytes'.
+    if not isinstance(mytype, utils.string_types + (bytes,)):
+        return mytype
+    name = str(mytype)
+    modname = 'future.types.' + name
+    if import_module:
+        __import__(modname)
+    module = sys.modules.get(modname)
+    return getattr(module, name, None)
+
+
+def _make_type_checker(function, checks):
+    """
+    Returns a wrapper for ``function`` that raises a TypeError if any of the
+    positional arguments numbered in ``checks``, a list of (argnum, type),
+    is of the corresponding type. Checking stops at the first argnum that
+    wasn't passed.
+    """
+    # Here we use type() rather than isinstance() because
+    # __instancecheck__ is being overridden. E.g.
+    # isinstance(b'abc', newbytes) is True on Py2.
+    errmsg = "argument can't be {0}"
+    if len(checks) == 1:
+        [(argnum, mytype)] = checks
+        msg = errmsg.format(mytype)
 
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if len(args) > argnum and type(args[argnum]) is mytype:
+                raise TypeError(msg)
             return function(*args, **kwargs)
         return wrapper
-    return decorator
+
+    checks = [(argnum, mytype, errmsg.format(mytype))
+              for (argnum, mytype) in checks]
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # Only restrict kw args only if they are passed:
+        nargs = len(args)
+        for (argnum, mytype, msg) in checks:
+            if nargs <= argnum:
+                break
+            if type(args[argnum]) is mytype:
+                raise TypeError(msg)
+        return function(*args, **kwargs)
+    return wrapper
 
 
 def no(mytype, argnums=(1,)):
@@ -213,6 +260,21 @@ def issubset(list1, list2):
     return False
 
 
+class disabled_method(object):
+    """
+    A descriptor that hides a method inherited from a builtin type, so that
+    e.g. ``hasattr(newbytes(b'abc'), 'encode')`` is False, as on Py3.
+
+    Unlike overriding ``__getattribute__``, this costs nothing on lookups of
+    other attributes.
+    """
+    def __init__(self, name, typename):
+        self.message = '%s method has been disabled in %s' % (name, typename)
+
+    def __get__(self, instance, owner=None):
+        raise AttributeError(self.message)
+
+
 if utils.PY3:
     import builtins
     bytes = builtins.bytes
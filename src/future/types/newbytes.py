@@ -10,7 +10,7 @@ import string
 import copy
 
 from future.utils import istext, isbytes, PY2, PY3, with_metaclass
-from future.types import no, issubset
+from future.types import no, disabled_method
 from future.types.newobject import newobject
 
 if PY2:
@@ -41,6 +41,16 @@ def _newchr(x):
         return chr(x)
 
 
+if PY3:
+    def _intbyte(i):
+        return _builtin_bytes((i,))
+else:
+    def _intbyte(i):
+        if not 0 <= i < 256:
+            raise ValueError('byte must be in range(0, 256)')
+        return chr(i)
+
+
 class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
     """
     A backport of the Python 3 bytes object to Py2
@@ -142,25 +152,20 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         return 'b' + "'{0}'".format(super(newbytes, self).__str__())
 
     def __getitem__(self, y):
-        value = super(newbytes, self).__getitem__(y)
-        if isinstance(y, Integral):
-            return ord(value)
-        else:
-            return newbytes(value)
+        value = _builtin_bytes.__getitem__(self, y)
+        if isinstance(y, slice):
+            return _from_native(value)
+        return value if PY3 else ord(value)
 
     def __getslice__(self, *args):
         return self.__getitem__(slice(*args))
 
     def __contains__(self, key):
-        if isinstance(key, int):
-            newbyteskey = newbytes([key])
-        # Don't use isinstance() here because we only want to catch
-        # newbytes, not Python 2 str:
-        elif type(key) == newbytes:
-            newbyteskey = key
-        else:
-            newbyteskey = newbytes(key)
-        return issubset(list(newbyteskey), list(self))
+        if isinstance(key, Integral):
+            key = _intbyte(key)
+        elif not isinstance(key, _builtin_bytes):
+            key = newbytes(key)
+        return _builtin_bytes.__contains__(self, key)
 
     @no(unicode)
     def __add__(self, other):
@@ -208,7 +213,7 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         for i, item in enumerate(iterable_of_bytes):
             if istext(item):
                 raise TypeError(errmsg.format(i, type(item)))
-        return newbytes(super(newbytes, self).join(iterable_of_bytes))
+        return _from_native(super(newbytes, self).join(iterable_of_bytes))
 
     @classmethod
     def fromhex(cls, string):
@@ -217,18 +222,22 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
 
     @no(unicode)
     def find(self, sub, *args):
+        if isinstance(sub, Integral):
+            sub = _intbyte(sub)
         return super(newbytes, self).find(sub, *args)
 
     @no(unicode)
     def rfind(self, sub, *args):
+        if isinstance(sub, Integral):
+            sub = _intbyte(sub)
         return super(newbytes, self).rfind(sub, *args)
 
     @no(unicode, (1, 2))
     def replace(self, old, new, *args):
         return newbytes(super(newbytes, self).replace(old, new, *args))
 
-    def encode(self, *args):
-        raise AttributeError("encode method has been disabled in newbytes")
+    # Hidden so that the ``hasattr`` builtin-fn returns False for it on Py2
+    encode = disabled_method('encode', 'newbytes')
 
     def decode(self, encoding='utf-8', errors='strict'):
         """
@@ -292,7 +301,7 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         # Py2 str.split() takes maxsplit as an optional parameter, not as a
         # keyword argument as in Python 3 bytes.
         parts = super(newbytes, self).split(sep, maxsplit)
-        return [newbytes(part) for part in parts]
+        return list(map(_from_native, parts))
 
     def splitlines(self, keepends=False):
         """
@@ -305,24 +314,24 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         # Py2 str.splitlines() takes keepends as an optional parameter,
         # not as a keyword argument as in Python 3 bytes.
         parts = super(newbytes, self).splitlines(keepends)
-        return [newbytes(part) for part in parts]
+        return list(map(_from_native, parts))
 
     @no(unicode)
     def rsplit(self, sep=None, maxsplit=-1):
         # Py2 str.rsplit() takes maxsplit as an optional parameter, not as a
         # keyword argument as in Python 3 bytes.
         parts = super(newbytes, self).rsplit(sep, maxsplit)
-        return [newbytes(part) for part in parts]
+        return list(map(_from_native, parts))
 
     @no(unicode)
     def partition(self, sep):
         parts = super(newbytes, self).partition(sep)
-        return tuple(newbytes(part) for part in parts)
+        return tuple(map(_from_native, parts))
 
     @no(unicode)
     def rpartition(self, sep):
         parts = super(newbytes, self).rpartition(sep)
-        return tuple(newbytes(part) for part in parts)
+        return tuple(map(_from_native, parts))
 
     @no(unicode, (1,))
     def rindex(self, sub, *args):
@@ -334,6 +343,7 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         pos = self.rfind(sub, *args)
         if pos == -1:
             raise ValueError('substring not found')
+        return pos
 
     @no(unicode)
     def index(self, sub, *args):
@@ -342,17 +352,9 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         Raises ValueError if byte is not in bytes and TypeError if can't
         be converted bytes or its length is not 1.
         '''
-        if isinstance(sub, int):
-            if len(args) == 0:
-                start, end = 0, len(self)
-            elif len(args) == 1:
-                start = args[0]
-            elif len(args) == 2:
-                start, end = args
-            else:
-                raise TypeError('takes at most 3 arguments')
-            return list(self)[start:end].index(sub)
-        if not isinstance(sub, bytes):
+        if isinstance(sub, Integral):
+            sub = _intbyte(sub)
+        elif not isinstance(sub, bytes):
             try:
                 sub = self.__class__(sub)
             except (TypeError, ValueError):
@@ -401,15 +403,6 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         # newbytes.__str__() returns e.g. "b'blah'", consistent with Py3 bytes.
         return super(newbytes, self).__str__()
 
-    def __getattribute__(self, name):
-        """
-        A trick to cause the ``hasattr`` builtin-fn to return False for
-        the 'encode' method on Py2.
-        """
-        if name in ['encode', u'encode']:
-            raise AttributeError("encode method has been disabled in newbytes")
-        return super(newbytes, self).__getattribute__(name)
-
     @no(unicode)
     def rstrip(self, bytes_to_strip=None):
         """
@@ -457,4 +450,12 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         return newbytes(string.maketrans(frm, to))
 
 
+def _from_native(value):
+    """
+    Wraps a native byte string (e.g. a slice or split result) in a newbytes
+    object without going through the argument handling in newbytes.__new__.
+    """
+    return _builtin_bytes.__new__(newbytes, value)
+
+
 __all__ = ['newbytes']
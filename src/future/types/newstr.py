@@ -43,7 +43,7 @@ representations of your objects portably across Py3 and Py2, use the
 from numbers import Number
 
 from future.utils import PY3, istext, with_metaclass, isnewbytes
-from future.types import no, issubset
+from future.types import no, issubset, disabled_method
 from future.types.newobject import newobject
 
 
@@ -176,8 +176,8 @@ class newstr(with_metaclass(BaseNewStr, unicode)):
     def replace(self, old, new, *args):
         return newstr(super(newstr, self).replace(old, new, *args))
 
-    def decode(self, *args):
-        raise AttributeError("decode method has been disabled in newstr")
+    # Hidden so that the ``hasattr`` builtin-fn returns False for it on Py2
+    decode = disabled_method('decode', 'newstr')
 
     def encode(self, encoding='utf-8', errors='strict'):
         """
@@ -335,15 +335,6 @@ class newstr(with_metaclass(BaseNewStr, unicode)):
             return super(newstr, self).__ge__(other)
         raise TypeError(self.unorderable_err.format(type(other)))
 
-    def __getattribute__(self, name):
-        """
-        A trick to cause the ``hasattr`` builtin-fn to return False for
-        the 'decode' method on Py2.
-        """
-        if name in ['decode', u'decode']:
-            raise AttributeError("decode method has been disabled in newstr")
-        return super(newstr, self).__getattribute__(name)
-
     def __native__(self):
         """
         A hook for the future.utils.native() function.
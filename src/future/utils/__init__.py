@@ -646,6 +646,99 @@ def native(obj):
         return obj
 
 
+def native_deep(obj):
+    """
+    On Py3, this is a no-op: native_deep(obj) -> obj
+
+    On Py2, returns obj with the backported types converted to their native
+    superclasses, like native(), including inside lists, tuples, sets,
+    frozensets and dicts (keys and values), recursively:
+
+    >>> from builtins import str, bytes, int
+    >>> native_deep({str(u'a'): [bytes(b'b'), (int(1),)]})
+    {u'a': ['b', (1L,)]}
+
+    Containers in which nothing needs converting are returned unchanged
+    rather than copied. Subclasses of the container types (other than the
+    backported dict and list) are not looked inside. Self-referential
+    containers are not supported.
+    """
+    if PY3:
+        return obj
+    return _native_deep(obj)
+
+
+def _native_deep(obj):
+    convert = _native_deep_dispatch.get(type(obj))
+    if convert is not None:
+        return convert(obj)
+    if hasattr(obj, '__native__'):
+        cls = type(obj)
+        if hasattr(cls, '__native__'):
+            # Remember the type, so later objects of it skip the lookups
+            convert = _native_deep_dispatch[cls] = _native_deep_via_native
+            return convert(obj)
+        return _native_deep_via_native(obj)
+    return obj
+
+
+def _native_deep_identity(obj):
+    return obj
+
+
+def _native_deep_via_native(obj):
+    # __native__() may return a container, e.g. for newlist and newdict
+    return _native_deep(obj.__native__())
+
+
+def _native_deep_items(iterable):
+    """
+    Returns a list of the converted items of iterable, or None if none of
+    them needed converting.
+    """
+    items = []
+    changed = False
+    for item in iterable:
+        new_item = _native_deep(item)
+        if new_item is not item:
+            changed = True
+        items.append(new_item)
+    return items if changed else None
+
+
+def _native_deep_container(container_type):
+    def convert(obj):
+        items = _native_deep_items(obj)
+        if items is None:
+            return obj
+        if container_type is list:
+            return items
+        return container_type(items)
+    return convert
+
+
+def _native_deep_dict(obj):
+    # Each (key, value) pair is converted as a tuple
+    pairs = _native_deep_items(obj.items())
+    if pairs is None:
+        return obj
+    return dict(pairs)
+
+
+# Conversions for the exact types. Native objects that contain nothing to
+# convert are returned as they are, without looking for __native__.
+_native_deep_dispatch = dict.fromkeys(
+    [type(None), bool, int, float, complex, bytes, type(u''), type],
+    _native_deep_identity)
+if PY2:
+    _native_deep_dispatch[long] = _native_deep_identity
+for _container_type in (list, tuple, set, frozenset):
+    _native_deep_dispatch[_container_type] = \
+        _native_deep_container(_container_type)
+_native_deep_dispatch[dict] = _native_deep_dict
+del _container_type
+
+
 # Implementation of exec_ is from ``six``:
 if PY3:
     import builtins
@@ -761,8 +854,8 @@ __all__ = ['PY2', 'PY26', 'PY3', 'PYPY',
            'implements_iterator', 'integer_types', 'is_new_style', 'isbytes',
            'isidentifier', 'isint', 'isnewbytes', 'istext', 'iteritems',
            'iterkeys', 'itervalues', 'lfilter', 'listitems', 'listvalues',
-           'lmap', 'lrange', 'lzip', 'native', 'native_bytes', 'native_str',
-           'native_str_to_bytes', 'old_div',
+           'lmap', 'lrange', 'lzip', 'native', 'native_bytes', 'native_deep',
+           'native_str', 'native_str_to_bytes', 'old_div',
            'python_2_unicode_compatible', 'raise_',
            'raise_with_traceback', 'reraise', 'string_types',
            'text_to_native_str', 'text_type', 'tobytes', 'viewitems',
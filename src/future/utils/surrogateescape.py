@@ -8,6 +8,7 @@ Source: misc/python/surrogateescape.py in https://bitbucket.org/haypo/misc
 # This code is released under the Python license and the BSD 2-clause license
 
 import codecs
+import re
 import sys
 
 from future import utils
@@ -30,12 +31,16 @@ def b(data):
     else:
         return data
 
-if utils.PY3:
-    _unichr = chr
-    bytes_chr = lambda code: bytes((code,))
-else:
-    _unichr = unichr
-    bytes_chr = chr
+# Maps each escaped byte U+DC00-U+DCFF back to U+0000-U+00FF, and each
+# byte 0x80-0xFF (decoded as latin-1) to its escape U+DC80-U+DCFF.
+_unescape_table = dict((0xDC00 + code, code) for code in range(0x100))
+_escape_table = dict((code, 0xDC00 + code) for code in range(0x80, 0x100))
+
+_escaped_span_re = re.compile(u('([\udc80-\udcff]+)'))
+_surrogate_re = re.compile(u('[\ud800-\udfff]'))
+_unencodable_surrogate_re = re.compile(u('[\ud800-\udc7f\udd00-\udfff]'))
+_unencodable_ascii_re = re.compile(u('[^\x00-\x7f\udc80-\udcff]'))
+_not_escaped_re = re.compile(u('[^\udc00-\udcff]'))
 
 def surrogateescape_handler(exc):
     """
@@ -73,53 +78,29 @@ def replace_surrogate_encode(mystring):
     Returns a (unicode) string, not the more logical bytes, because the codecs
     register_error functionality expects this.
     """
-    decoded = []
-    for ch in mystring:
-        # if utils.PY3:
-        #     code = ch
-        # else:
-        code = ord(ch)
-
-        # The following magic comes from Py3.3's Python/codecs.c file:
-        if not 0xD800 <= code <= 0xDCFF:
-            # Not a surrogate. Fail with the original exception.
-            raise NotASurrogateError
-        # mybytes = [0xe0 | (code >> 12),
-        #            0x80 | ((code >> 6) & 0x3f),
-        #            0x80 | (code & 0x3f)]
-        # Is this a good idea?
-        if 0xDC00 <= code <= 0xDC7F:
-            decoded.append(_unichr(code - 0xDC00))
-        elif code <= 0xDCFF:
-            decoded.append(_unichr(code - 0xDC00))
-        else:
-            raise NotASurrogateError
-    return str().join(decoded)
+    # The following magic comes from Py3.3's Python/codecs.c file: only
+    # U+DC00-U+DCFF are escaped bytes. Anything else fails with the
+    # original exception.
+    if _not_escaped_re.search(mystring):
+        raise NotASurrogateError
+    return mystring.translate(_unescape_table)
 
 
 def replace_surrogate_decode(mybytes):
     """
     Returns a (unicode) string
     """
-    decoded = []
-    for ch in mybytes:
-        # We may be parsing newbytes (in which case ch is an int) or a native
-        # str on Py2
-        if isinstance(ch, int):
-            code = ch
-        else:
-            code = ord(ch)
-        if 0x80 <= code <= 0xFF:
-            decoded.append(_unichr(0xDC00 + code))
-        elif code <= 0x7F:
-            decoded.append(_unichr(code))
-        else:
-            # # It may be a bad byte
-            # # Try swallowing it.
-            # continue
-            # print("RAISE!")
-            raise NotASurrogateError
-    return str().join(decoded)
+    # Every byte decodes to the code point of the same value under latin-1;
+    # the bytes 0x80-0xFF are then mapped to their escapes. This accepts
+    # newbytes as well as a native str on Py2.
+    return codecs.latin_1_decode(mybytes)[0].translate(_escape_table)
+
+
+def _encode_escaped(span):
+    """
+    Returns the bytes escaped as U+DC80-U+DCFF in span.
+    """
+    return span.translate(_unescape_table).encode('latin-1')
 
 
 def encodefilename(fn):
@@ -127,36 +108,37 @@ def encodefilename(fn):
         # ASCII encoder of Python 2 expects that the error handler returns a
         # Unicode string encodable to ASCII, whereas our surrogateescape error
         # handler has to return bytes in 0x80-0xFF range.
-        encoded = []
-        for index, ch in enumerate(fn):
-            code = ord(ch)
-            if code < 128:
-                ch = bytes_chr(code)
-            elif 0xDC80 <= code <= 0xDCFF:
-                ch = bytes_chr(code - 0xDC00)
-            else:
-                raise UnicodeEncodeError(FS_ENCODING,
-                    fn, index, index+1,
-                    'ordinal not in range(128)')
-            encoded.append(ch)
-        return bytes().join(encoded)
+        try:
+            return fn.encode('ascii')
+        except UnicodeEncodeError:
+            pass
+        match = _unencodable_ascii_re.search(fn)
+        if match:
+            index = match.start()
+            # On Py2, UnicodeEncodeError() needs the encoding as a native str
+            raise UnicodeEncodeError(str(FS_ENCODING),
+                fn, index, index+1,
+                'ordinal not in range(128)')
+        return _encode_escaped(fn)
     elif FS_ENCODING == 'utf-8':
         # UTF-8 encoder of Python 2 encodes surrogates, so U+DC80-U+DCFF
         # doesn't go through our error handler
+        if not _surrogate_re.search(fn):
+            return fn.encode('utf-8')
+        match = _unencodable_surrogate_re.search(fn)
+        if match:
+            index = match.start()
+            raise UnicodeEncodeError(
+                str(FS_ENCODING),
+                fn, index, index+1, 'surrogates not allowed')
+        # Alternating runs of ordinary text and of escaped bytes
+        parts = _escaped_span_re.split(fn)
         encoded = []
-        for index, ch in enumerate(fn):
-            code = ord(ch)
-            if 0xD800 <= code <= 0xDFFF:
-                if 0xDC80 <= code <= 0xDCFF:
-                    ch = bytes_chr(code - 0xDC00)
-                    encoded.append(ch)
-                else:
-                    raise UnicodeEncodeError(
-                        FS_ENCODING,
-                        fn, index, index+1, 'surrogates not allowed')
+        for i, part in enumerate(parts):
+            if i % 2:
+                encoded.append(_encode_escaped(part))
             else:
-                ch_utf8 = ch.encode('utf-8')
-                encoded.append(ch_utf8)
+                encoded.append(part.encode('utf-8'))
         return bytes().join(encoded)
     else:
         return fn.encode(FS_ENCODING, FS_ERRORS)
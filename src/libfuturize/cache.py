@@ -0,0 +1,150 @@
+"""
+An on-disk cache of refactoring results for ``futurize`` and ``pasteurize``.
+
+Each entry is keyed by a hash of the source text and the absolute path of
+the file, together with everything else that can influence the output: the
+selected fixers, the refactoring options, the version of ``future`` and the
+Python version whose ``lib2to3`` grammar is used. A hit lets the refactoring
+tool skip parsing the file entirely and replay the stored output instead.
+
+A few fixers (``FILESYSTEM_FIXERS``) also look at other files on disk: they
+check whether a module of the imported name exists next to the file. When any
+of them is selected, the key also includes the names of the modules and
+subdirectories in the file's directory.
+
+Entries are small JSON files stored under the cache directory. They are
+written atomically, so several processes can safely share one cache.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from future import __version__
+
+
+# Fixers whose output depends on the modules next to the file being refactored
+FILESYSTEM_FIXERS = frozenset([
+    'lib2to3.fixes.fix_import',
+    'libfuturize.fixes.fix_absolute_import',
+])
+
+# The suffixes of the sibling modules that FILESYSTEM_FIXERS look for
+_MODULE_SUFFIXES = ('.py', '.pyc', '.so', '.sl', '.pyd')
+
+
+def sibling_modules(dirname):
+    """
+    Returns the sorted names of the modules and subdirectories in
+    ``dirname`` that ``FILESYSTEM_FIXERS`` may look for, or an empty list if
+    ``dirname`` is not a package (in which case they look for nothing).
+    """
+    try:
+        names = os.listdir(dirname or os.curdir)
+    except OSError:
+        return []
+    if '__init__.py' not in names:
+        return []
+    return sorted(name for name in names
+                  if name.endswith(_MODULE_SUFFIXES) or
+                  os.path.isdir(os.path.join(dirname, name)))
+
+
+class RefactorCache(object):
+    """
+    A content-addressed store of refactored source text.
+
+    Args:
+        cache_dir: the directory in which to store entries. It is created on
+            first use.
+        fixer_names: the fully qualified names of the fixers to run.
+        options: the option dict passed to the refactoring tool.
+        explicit: the fixers that were requested explicitly.
+    """
+
+    def __init__(self, cache_dir, fixer_names, options=None, explicit=()):
+        self.cache_dir = cache_dir
+        h = hashlib.sha256()
+        parts = [__version__, '%d.%d' % sys.version_info[:2]]
+        parts.extend(sorted(fixer_names))
+        parts.append('--')
+        parts.extend(sorted(explicit or ()))
+        parts.append('--')
+        parts.extend('%s=%r' % item for item in sorted((options or {}).items()))
+        for part in parts:
+            h.update(part.encode('utf-8') + b'\0')
+        self.namespace = h.hexdigest()
+        self.filesystem = bool(FILESYSTEM_FIXERS.intersection(fixer_names))
+        # Directory path -> sibling_modules() of it, for this run
+        self._siblings = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source, filename):
+        """
+        Returns the cache key for the given source text of the given file.
+        """
+        h = hashlib.sha256(self.namespace.encode('ascii'))
+        path = os.path.abspath(filename)
+        h.update(path.encode('utf-8', 'surrogatepass') + b'\0')
+        if self.filesystem:
+            dirname = os.path.dirname(path)
+            if dirname not in self._siblings:
+                self._siblings[dirname] = sibling_modules(dirname)
+            for name in self._siblings[dirname]:
+                h.update(name.encode('utf-8', 'surrogatepass') + b'/')
+            h.update(b'\0')
+        h.update(source.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key[2:] + '.json')
+
+    def get(self, source, filename):
+        """
+        Returns the cached entry for ``source`` read from ``filename`` as a
+        dict with the keys
+        ``output`` (the refactored text, or None if the refactoring left the
+        source unchanged) and ``messages`` (the fixer warnings emitted), or
+        None if there is no entry.
+        """
+        try:
+            with io.open(self._path(self.key(source, filename)), 'r',
+                         encoding='utf-8') as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, source, filename, output, messages=()):
+        """
+        Stores the result of refactoring ``source`` read from ``filename``.
+        Pass None as ``output``
+        if the source was left unchanged. Failures to write are ignored: the
+        cache is only ever an optimization.
+        """
+        path = self._path(self.key(source, filename))
+        entry = {'output': output, 'messages': list(messages)}
+        dirname = os.path.dirname(path)
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fd, tmp = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        except (IOError, OSError):
+            return
+        try:
+            with io.open(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False))
+            os.rename(tmp, path)
+        except (IOError, OSError):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
@@ -0,0 +1,124 @@
+"""
+Helpers for restricting a ``futurize`` or ``pasteurize`` run to a subset of
+files: those changed since a git revision (``--changed-since``) or those
+listed in a file or on stdin (``--files-from``).
+
+This lets pre-commit hooks and CI jobs check only the files in a change
+instead of walking every directory passed on the command line.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import os
+import sys
+
+from future.utils import PY3
+from future.moves.subprocess import CalledProcessError, check_output
+
+
+def _git_paths(cmd):
+    output = check_output(cmd)
+    if PY3:
+        output = output.decode(sys.getfilesystemencoding(), 'surrogateescape')
+    return [path for path in output.split('\0') if path]
+
+
+def git_changed_files(rev):
+    """
+    Returns the paths (relative to the current directory) of the files below
+    the current directory that have been added or modified since the git
+    revision ``rev``, including uncommitted changes and untracked files.
+
+    Raises ``OSError`` if git cannot be run and ``CalledProcessError`` if
+    the revision is unknown.
+    """
+    changed = _git_paths(['git', 'diff', '--name-only', '--relative', '-z',
+                          '--diff-filter=d', rev, '--'])
+    untracked = _git_paths(['git', 'ls-files', '--others',
+                            '--exclude-standard', '-z'])
+    return changed + untracked
+
+
+def read_file_list(f):
+    """
+    Returns the paths listed one per line in the file object ``f``, ignoring
+    blank lines.
+    """
+    return [line.rstrip('\r\n') for line in f if line.strip()]
+
+
+def _is_python_file(relpath):
+    # The same rule as lib2to3's RefactoringTool.refactor_dir(): only
+    # .py files, and nothing whose name or directory starts with a dot.
+    parts = relpath.split(os.sep)
+    return (os.path.splitext(relpath)[1] == os.extsep + 'py' and
+            not any(part.startswith('.') for part in parts))
+
+
+def restrict_paths(args, selected):
+    """
+    Returns the files to refactor when only the paths in ``selected`` should
+    be considered.
+
+    A file in ``args`` is kept if it is selected. A directory in ``args``
+    contributes the selected Python files below it, spelled relative to the
+    directory as given, so that ``--output-dir`` mirroring still works. If
+    ``args`` is empty, all selected Python files are returned. Files that no
+    longer exist are dropped.
+    """
+    selected = set(os.path.abspath(path) for path in selected
+                   if os.path.isfile(path))
+    if not args:
+        return sorted(os.path.relpath(path) for path in selected
+                      if _is_python_file(os.path.basename(path)))
+    items = []
+    seen = set()
+    for arg in args:
+        abs_arg = os.path.abspath(arg)
+        if not os.path.isdir(arg):
+            if abs_arg in selected and abs_arg not in seen:
+                seen.add(abs_arg)
+                items.append(arg)
+            continue
+        for path in sorted(selected):
+            if not path.startswith(abs_arg.rstrip(os.sep) + os.sep):
+                continue
+            relpath = os.path.relpath(path, abs_arg)
+            if _is_python_file(relpath) and path not in seen:
+                seen.add(path)
+                items.append(os.path.join(arg, relpath))
+    return items
+
+
+def select_files(options, args):
+    """
+    Returns the files and directories to refactor, given the parsed
+    command-line ``options`` and positional ``args`` of ``futurize`` or
+    ``pasteurize``. With ``--changed-since`` or ``--files-from``, these are
+    the selected files among ``args`` (see ``restrict_paths()``); otherwise
+    they are ``args`` themselves.
+
+    Prints an error and returns None if there is nothing to refactor or the
+    selected files can't be determined.
+    """
+    if not (options.changed_since or options.files_from):
+        if not args:
+            print("At least one file or directory argument required.",
+                  file=sys.stderr)
+            print("Use --help to show usage.", file=sys.stderr)
+            return None
+        return args
+    selected = []
+    try:
+        if options.files_from == '-':
+            selected.extend(read_file_list(sys.stdin))
+        elif options.files_from:
+            with open(options.files_from) as f:
+                selected.extend(read_file_list(f))
+        if options.changed_since:
+            selected.extend(git_changed_files(options.changed_since))
+    except (EnvironmentError, CalledProcessError) as err:
+        print("Can't determine the files to refactor: %s" % err,
+              file=sys.stderr)
+        return None
+    return restrict_paths(args, selected)
@@ -0,0 +1,97 @@
+"""
+The entry points of the ``futurize`` and ``pasteurize`` scripts.
+
+If ``FUTURIZE_SERVER`` is set, the scripts first try to hand their arguments
+to the server listening on that socket (see ``libfuturize.server``). This
+module therefore imports nothing but the standard library modules needed to
+talk to the server: ``lib2to3`` and the fixers are only imported if no server
+is running.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import json
+import os
+import socket
+import sys
+
+
+def _starts_server(args):
+    """
+    Returns True if the command-line arguments ``args`` include --server
+    (or an abbreviation of it, which optparse accepts).
+    """
+    for arg in args:
+        if arg == '--':
+            break
+        name = arg.split('=', 1)[0]
+        if len(name) > 3 and '--server'.startswith(name):
+            return True
+    return False
+
+
+def run_client(address, program, args):
+    """
+    Asks the server at ``address`` to run ``program`` ('futurize' or
+    'pasteurize') with the command-line arguments ``args`` in the current
+    directory, and copies its output to stdout and stderr.
+
+    Returns the exit status, or None if no server is listening at
+    ``address`` or if ``args`` ask to start a server.
+    """
+    if not hasattr(socket, 'AF_UNIX') or _starts_server(args):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except socket.error:
+        sock.close()
+        return None
+    try:
+        request = {'program': program, 'args': list(args),
+                   'cwd': os.getcwd(),
+                   'stdin': sys.stdin.read() if '-' in args else None}
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        for line in sock.makefile('rb'):
+            message = json.loads(line.decode('utf-8'))
+            if 'exit' in message:
+                return message['exit']
+            for name, text in message.items():
+                stream = getattr(sys, name)
+                stream.write(text)
+                stream.flush()
+    finally:
+        sock.close()
+    print("The futurize server at %s closed the connection." % address,
+          file=sys.stderr)
+    return 1
+
+
+def _forward(program):
+    """
+    Forwards this invocation of ``program`` to the server named by
+    ``FUTURIZE_SERVER``. Returns its exit status, or None if there is no
+    server to forward to.
+    """
+    address = os.environ.get('FUTURIZE_SERVER')
+    if not address:
+        return None
+    return run_client(address, program, sys.argv[1:])
+
+
+def futurize():
+    """Runs the futurize script. Returns a suggested exit status."""
+    status = _forward('futurize')
+    if status is None:
+        from libfuturize.main import main
+        status = main()
+    return status
+
+
+def pasteurize():
+    """Runs the pasteurize script. Returns a suggested exit status."""
+    status = _forward('pasteurize')
+    if status is None:
+        from libpasteurize.main import main
+        status = main()
+    return status
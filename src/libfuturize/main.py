@@ -70,9 +70,13 @@ import logging
 import optparse
 import os
 
-from lib2to3.main import warn, StdoutRefactoringTool
+from lib2to3.main import warn
 from lib2to3 import refactor
 
+from libfuturize.changes import select_files
+from libfuturize.refactor import refactoring_tool
+from libfuturize.server import serve
+
 from libfuturize.fixes import (lib2to3_fix_names_stage1,
                                lib2to3_fix_names_stage2,
                                libfuturize_fix_names_stage1,
@@ -135,11 +139,26 @@ def main(args=None):
                       help="Append this string to all output filenames."
                       " Requires -n if non-empty. For Python >= 2.7 only."
                       "ex: --add-suffix='3' will generate .py3 files.")
+    parser.add_option("--cache-dir", action="store", type="str", default="",
+                      help="Cache refactoring results in this directory and "
+                      "reuse them for files whose contents have not changed.")
+    parser.add_option("--changed-since", action="store", type="str",
+                      metavar="REV", help="Only refactor files that have "
+                      "been added or modified since this git revision.")
+    parser.add_option("--files-from", action="store", type="str",
+                      metavar="FILE", help="Only refactor the files listed "
+                      "(one per line) in FILE, or on stdin if FILE is '-'.")
+    parser.add_option("--server", action="store", type="str",
+                      metavar="SOCKET", help="Keep running and serve "
+                      "futurize and pasteurize requests on this Unix socket. "
+                      "Set FUTURIZE_SERVER=SOCKET to send requests to it.")
 
     # Parse command line arguments
     flags = {}
     refactor_stdin = False
     options, args = parser.parse_args(args)
+    if options.server:
+        return serve(options.server)
 
     if options.write_unchanged_files:
         flags["write_unchanged_files"] = True
@@ -162,6 +181,10 @@ def main(args=None):
         if options.write:
             print("Can't write to stdin.", file=sys.stderr)
             return 2
+        if options.changed_since or options.files_from:
+            print("Can't use --changed-since or --files-from with stdin.",
+                  file=sys.stderr)
+            return 2
     # Is this ever necessary?
     if options.print_function:
         flags["print_function"] = True
@@ -199,10 +222,8 @@ def main(args=None):
             print(fixname)
         if not args:
             return 0
-    if not args:
-        print("At least one file or directory argument required.",
-              file=sys.stderr)
-        print("Use --help to show usage.", file=sys.stderr)
+    items = select_files(options, args)
+    if items is None:
         return 2
 
     unwanted_fixes = set()
@@ -276,7 +297,7 @@ def main(args=None):
         requested = avail_fixes.union(explicit)
     fixer_names = (requested | extra_fixes) - unwanted_fixes
 
-    input_base_dir = os.path.commonprefix(args)
+    input_base_dir = os.path.commonprefix(args or items)
     if (input_base_dir and not input_base_dir.endswith(os.sep)
         and not os.path.isdir(input_base_dir)):
         # One or more similar names were passed, their directory is the base.
@@ -298,10 +319,10 @@ def main(args=None):
                         'input_base_dir': input_base_dir,
                        }
 
-    rt = StdoutRefactoringTool(
+    rt = refactoring_tool(
             sorted(fixer_names), flags, sorted(explicit),
             options.nobackups, not options.no_diffs,
-            **extra_kwargs)
+            cache_dir=options.cache_dir, **extra_kwargs)
 
     # Refactor all files and directories passed as arguments
     if not rt.errors:
@@ -309,7 +330,7 @@ def main(args=None):
             rt.refactor_stdin()
         else:
             try:
-                rt.refactor(args, options.write, None,
+                rt.refactor(items, options.write, None,
                             options.processes)
             except refactor.MultiprocessingUnsupported:
                 assert options.processes > 1
@@ -0,0 +1,442 @@
+"""
+The refactoring tool used by the ``futurize`` and ``pasteurize`` scripts.
+
+This extends lib2to3's ``StdoutRefactoringTool`` with an optional on-disk
+cache of results (see ``libfuturize.cache``), a cheaper tree walk and a
+process pool for ``-j``.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from itertools import chain
+
+import os
+
+from lib2to3 import pytree
+from lib2to3.fixer_util import find_root
+from lib2to3.main import StdoutRefactoringTool
+from lib2to3.refactor import MultiprocessingUnsupported
+
+from future.utils import text_type
+
+from libfuturize.cache import RefactorCache
+
+
+# Flat equivalents of the recursive generators Base.pre_order(),
+# Base.post_order() and Base.leaves() in lib2to3.pytree. Each level of a
+# recursive generator adds a frame that every yielded node has to pass
+# through, which makes walking deep parse trees needlessly slow. These keep
+# an explicit stack of list iterators instead. Each iterator is created at
+# the same point as in the recursive version, so fixers that modify the tree
+# during the walk see exactly the same sequence of nodes.
+
+def _pre_order(node):
+    yield node
+    stack = [iter(node.children)]
+    while stack:
+        for child in stack[-1]:
+            yield child
+            stack.append(iter(child.children))
+            break
+        else:
+            stack.pop()
+
+
+def _post_order(node):
+    stack = [(node, iter(node.children))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            stack.append((child, iter(child.children)))
+            break
+        else:
+            stack.pop()
+            yield node
+
+
+def _leaves(node):
+    if not isinstance(node, pytree.Node):
+        yield node
+        return
+    stack = [iter(node.children)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, pytree.Node):
+                stack.append(iter(child.children))
+                break
+            yield child
+        else:
+            stack.pop()
+
+
+class FuturizeRefactoringTool(StdoutRefactoringTool):
+    """
+    A ``StdoutRefactoringTool`` that can reuse the results of earlier runs.
+
+    If ``cache_dir`` is given, the refactored output of each file is stored
+    there, keyed by the file's path and contents and the refactoring
+    configuration. Later runs over unchanged files replay the stored output
+    (printing the same diffs and writing the same files) without parsing
+    them again.
+
+    Most fixers are matched against the tree in a single pass by lib2to3's
+    bottom-up matcher. The few that are not (``bmi_pre_order`` and
+    ``bmi_post_order``) need a walk over every node; this tool walks the
+    tree without recursive generators and skips a walk entirely when no
+    fixer needs it. The refactored output is identical to lib2to3's.
+    """
+
+    def __init__(self, fixers, options, explicit, nobackups, show_diffs,
+                 cache_dir=None, **kwargs):
+        # Record the messages logged while loading the fixers, so that
+        # reset() can repeat them
+        self._setup_messages = []
+        super(FuturizeRefactoringTool, self).__init__(
+            fixers, options, explicit, nobackups, show_diffs, **kwargs)
+        self._fixer_messages = self._setup_messages
+        self._setup_messages = None
+        # Everything a worker process needs to build an equivalent tool
+        self._worker_args = (fixers, self.options, explicit, cache_dir)
+        if cache_dir:
+            self.cache = RefactorCache(cache_dir, fixers, self.options,
+                                       explicit)
+        else:
+            self.cache = None
+        # lib2to3 maps every node type to a (usually empty) list of fixers,
+        # so it walks the whole tree even if there are no fixers to apply.
+        self._pre_order_heads = dict(
+            (node_type, fixers)
+            for node_type, fixers in self.bmi_pre_order_heads.items()
+            if fixers)
+        self._post_order_heads = dict(
+            (node_type, fixers)
+            for node_type, fixers in self.bmi_post_order_heads.items()
+            if fixers)
+
+    def reset(self, nobackups, show_diffs, input_base_dir='', output_dir='',
+              append_suffix=''):
+        """
+        Prepares this tool for another run with the same fixers and options,
+        setting the remaining constructor arguments afresh and forgetting
+        the files, errors and messages of earlier runs.
+        """
+        self.nobackups = nobackups
+        self.show_diffs = show_diffs
+        if input_base_dir and not input_base_dir.endswith(os.sep):
+            input_base_dir += os.sep
+        self._input_base_dir = input_base_dir
+        self._output_dir = output_dir
+        self._append_suffix = append_suffix
+        self.errors = []
+        self.files = []
+        self.wrote = False
+        # The fixers hold a reference to this list, so empty it in place
+        del self.fixer_log[:]
+        for msg, args in self._fixer_messages:
+            self.log_message(msg, *args)
+
+    def log_message(self, msg, *args):
+        if self._setup_messages is not None:
+            self._setup_messages.append((msg, args))
+        super(FuturizeRefactoringTool, self).log_message(msg, *args)
+
+    def refactor(self, items, write=False, doctests_only=False,
+                 num_processes=1):
+        """Refactor a list of files and directories.
+
+        With more than one process, the files are refactored by a pool of
+        worker processes, each with its own long-lived refactoring tool. The
+        largest files are handed out first to balance the load. The results
+        are sent back to this process, which prints the diffs, writes the
+        files and logs the workers' messages in the order of ``items``, just
+        as a single process would.
+        """
+        if num_processes <= 1:
+            return super(FuturizeRefactoringTool, self).refactor(
+                items, write, doctests_only)
+        try:
+            import multiprocessing
+        except ImportError:
+            raise MultiprocessingUnsupported
+        filenames = list(self._python_files(items))
+        if not filenames:
+            return
+        pool = multiprocessing.Pool(min(num_processes, len(filenames)),
+                                    _init_worker, (self._worker_args,))
+        try:
+            results = [None] * len(filenames)
+            for i in sorted(range(len(filenames)),
+                            key=lambda i: -_file_size(filenames[i])):
+                results[i] = pool.apply_async(_refactor_in_worker,
+                                              (filenames[i], doctests_only))
+            pool.close()
+            for filename, result in zip(filenames, results):
+                (old_text, new_text, encoding), records, messages = result.get()
+                for method, text in records:
+                    getattr(self, method)("%s", text)
+                self.fixer_log.extend(messages)
+                if new_text is not None:
+                    self.processed_file(new_text, filename, old_text, write,
+                                        encoding)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _python_files(self, items):
+        """
+        Yields the files that refactor() would refactor for ``items``, in
+        the same order.
+        """
+        py_ext = os.extsep + "py"
+        for dir_or_file in items:
+            if not os.path.isdir(dir_or_file):
+                yield dir_or_file
+                continue
+            for dirpath, dirnames, filenames in os.walk(dir_or_file):
+                self.log_debug("Descending into %s", dirpath)
+                dirnames.sort()
+                filenames.sort()
+                for name in filenames:
+                    if (not name.startswith(".") and
+                        os.path.splitext(name)[1] == py_ext):
+                        yield os.path.join(dirpath, name)
+                # Modify dirnames in-place to remove subdirs with leading dots
+                dirnames[:] = [dn for dn in dirnames if not dn.startswith(".")]
+
+    def refactor_file(self, filename, write=False, doctests_only=False):
+        """Refactors a file."""
+        old_text, new_text, encoding = self._refactor_file_texts(
+            filename, doctests_only)
+        if new_text is not None:
+            self.processed_file(new_text, filename, old_text, write, encoding)
+
+    def _refactor_file_texts(self, filename, doctests_only=False):
+        """
+        Does the work of lib2to3's refactor_file() without printing diffs or
+        writing any files.
+
+        Returns a tuple (old_text, new_text, encoding) of the arguments to
+        pass to processed_file(). new_text is None if there is nothing to
+        pass on.
+        """
+        input, encoding = self._read_python_source(filename)
+        if input is None:
+            # Reading the file failed.
+            return None, None, None
+        input += "\n" # Silence certain parse errors
+        if doctests_only:
+            self.log_debug("Refactoring doctests in %s", filename)
+            output = self.refactor_docstring(input, filename)
+            if self.write_unchanged_files or output != input:
+                return input, output, encoding
+            self.log_debug("No doctest changes in %s", filename)
+            return input, None, encoding
+        if self.cache is not None:
+            entry = self.cache.get(input, filename)
+        else:
+            entry = None
+        if entry is not None:
+            self.log_debug("Using cached result for %s", filename)
+            self.fixer_log.extend(entry['messages'])
+            output = entry['output']
+            if output is None and self.write_unchanged_files:
+                output = input
+        else:
+            tree = self.refactor_string(input, filename)
+            if tree and (tree.was_changed or self.write_unchanged_files):
+                output = text_type(tree)
+            else:
+                output = None
+        if output is None:
+            self.log_debug("No changes in %s", filename)
+            return input[:-1], None, encoding
+        # The [:-1] is to take off the \n we added earlier
+        return input[:-1], output[:-1], encoding
+
+    def refactor_string(self, data, name):
+        n_messages = len(self.fixer_log)
+        tree = super(FuturizeRefactoringTool, self).refactor_string(data, name)
+        if tree is not None and self.cache is not None:
+            output = text_type(tree) if tree.was_changed else None
+            self.cache.put(data, name, output, self.fixer_log[n_messages:])
+        return tree
+
+    def refactor_tree(self, tree, name):
+        """Refactors a parse tree (modifying the tree in place).
+
+        This follows lib2to3's RefactoringTool.refactor_tree() step by step,
+        using the flat tree walks above.
+
+        Returns:
+            True if the tree was modified, False otherwise.
+        """
+        for fixer in chain(self.pre_order, self.post_order):
+            fixer.start_tree(tree, name)
+
+        # Use traditional matching for the incompatible fixers
+        self.traverse_by(self._pre_order_heads, _pre_order(tree))
+        self.traverse_by(self._post_order_heads, _post_order(tree))
+
+        # Obtain a set of candidate nodes
+        match_set = self.BM.run(_leaves(tree))
+
+        while any(match_set.values()):
+            for fixer in self.BM.fixers:
+                if fixer in match_set and match_set[fixer]:
+                    # Sort by depth; apply fixers from bottom (of the AST) to top
+                    match_set[fixer].sort(key=pytree.Base.depth, reverse=True)
+
+                    if fixer.keep_line_order:
+                        # Some fixers (e.g. fix_imports) must be applied
+                        # with the original file's line order
+                        match_set[fixer].sort(key=pytree.Base.get_lineno)
+
+                    for node in list(match_set[fixer]):
+                        if node in match_set[fixer]:
+                            match_set[fixer].remove(node)
+
+                        try:
+                            find_root(node)
+                        except ValueError:
+                            # This node has been cut off from a
+                            # previous transformation; skip
+                            continue
+
+                        if node.fixers_applied and fixer in node.fixers_applied:
+                            # Do not apply the same fixer again
+                            continue
+
+                        results = fixer.match(node)
+
+                        if results:
+                            new = fixer.transform(node, results)
+                            if new is not None:
+                                node.replace(new)
+                                for node in _post_order(new):
+                                    # Do not apply the fixer again to
+                                    # this or any subnode
+                                    if not node.fixers_applied:
+                                        node.fixers_applied = []
+                                    node.fixers_applied.append(fixer)
+
+                                # Update the original match set for
+                                # the added code
+                                new_matches = self.BM.run(_leaves(new))
+                                for fxr in new_matches:
+                                    if fxr not in match_set:
+                                        match_set[fxr] = []
+
+                                    match_set[fxr].extend(new_matches[fxr])
+
+        for fixer in chain(self.pre_order, self.post_order):
+            fixer.finish_tree(tree, name)
+        return tree.was_changed
+
+    def traverse_by(self, fixers, traversal):
+        """Traverse an AST, applying a set of fixers to each node.
+
+        Unlike lib2to3's version, ``fixers`` need not contain every node
+        type.
+        """
+        if not fixers:
+            return
+        for node in traversal:
+            for fixer in fixers.get(node.type, ()):
+                results = fixer.match(node)
+                if results:
+                    new = fixer.transform(node, results)
+                    if new is not None:
+                        node.replace(new)
+                        node = new
+
+
+# Tools kept for reuse by refactoring_tool(), keyed by the arguments that
+# determine their fixers. None unless keep_tools_warm() has been called.
+_warm_tools = None
+
+
+def keep_tools_warm():
+    """
+    Makes refactoring_tool() keep the tools it creates and reuse them for
+    later calls with the same fixers and options. Setting up the fixers is
+    a large part of the cost of a short futurize run, so a long-lived
+    process (see ``libfuturize.server``) only pays it once per configuration.
+    """
+    global _warm_tools
+    if _warm_tools is None:
+        _warm_tools = {}
+
+
+def refactoring_tool(fixers, options, explicit, nobackups, show_diffs,
+                     cache_dir=None, **kwargs):
+    """
+    Returns a FuturizeRefactoringTool for the given arguments, reusing an
+    earlier one if keep_tools_warm() has been called.
+    """
+    if _warm_tools is None:
+        return FuturizeRefactoringTool(fixers, options, explicit, nobackups,
+                                       show_diffs, cache_dir=cache_dir,
+                                       **kwargs)
+    key = (tuple(fixers), tuple(sorted(options.items())),
+           tuple(sorted(explicit)), cache_dir)
+    rt = _warm_tools.get(key)
+    if rt is None:
+        rt = FuturizeRefactoringTool(fixers, options, explicit, nobackups,
+                                     show_diffs, cache_dir=cache_dir,
+                                     **kwargs)
+        _warm_tools[key] = rt
+    else:
+        rt.reset(nobackups, show_diffs, **kwargs)
+    return rt
+
+
+class _WorkerRefactoringTool(FuturizeRefactoringTool):
+    """
+    The refactoring tool kept by each worker process of a
+    FuturizeRefactoringTool. Instead of logging, it records its messages
+    (already formatted, since their arguments may not be picklable) for the
+    parent process to log in order.
+    """
+
+    def __init__(self, fixers, options, explicit, cache_dir):
+        self.records = []
+        super(_WorkerRefactoringTool, self).__init__(
+            fixers, options, explicit, True, False, cache_dir=cache_dir)
+
+    def _record(self, method, msg, args):
+        if args:
+            msg = msg % args
+        self.records.append((method, msg))
+
+    def log_error(self, msg, *args, **kwargs):
+        self._record('log_error', msg, args)
+
+    def log_message(self, msg, *args):
+        self._record('log_message', msg, args)
+
+    def log_debug(self, msg, *args):
+        self._record('log_debug', msg, args)
+
+
+_worker_tool = None
+
+
+def _init_worker(args):
+    global _worker_tool
+    _worker_tool = _WorkerRefactoringTool(*args)
+
+
+def _refactor_in_worker(filename, doctests_only):
+    rt = _worker_tool
+    del rt.records[:]
+    # The fixers hold a reference to this list, so empty it in place
+    del rt.fixer_log[:]
+    texts = rt._refactor_file_texts(filename, doctests_only)
+    return texts, list(rt.records), list(rt.fixer_log)
+
+
+def _file_size(filename):
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return 0
@@ -0,0 +1,211 @@
+"""
+A long-lived server for ``futurize`` and ``pasteurize``.
+
+Every ``futurize`` or ``pasteurize`` run imports lib2to3 and all the fixer
+modules and compiles the fixers' patterns before it looks at a single file.
+When the scripts are run once per file, e.g. from editors or pre-commit
+hooks, this startup cost dominates. Start a server once with::
+
+    $ futurize --server /tmp/futurize.sock
+
+and point later invocations at it::
+
+    $ export FUTURIZE_SERVER=/tmp/futurize.sock
+    $ futurize --stage1 mymodule.py
+
+The scripts then forward their arguments, working directory and (if reading
+from ``-``) standard input to the server (see ``libfuturize.client``), which
+runs them with refactoring tools kept warm from earlier requests, and stream
+back its output and exit status. If no server is listening, the scripts run as
+usual.
+
+Requests are handled one at a time. The server uses Unix domain sockets, so
+it is not available on Windows.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import errno
+import json
+import logging
+import os
+import socket
+import stat
+import sys
+import traceback
+
+from future.moves import socketserver
+from future.utils import text_type
+
+
+class _Output(object):
+    """
+    Collects what a request writes to stdout and stderr and sends it to the
+    client as JSON lines, preserving the order of the two streams.
+    """
+
+    buffer_size = 65536
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.chunks = []
+        self.size = 0
+
+    def write(self, stream, text):
+        if self.chunks and self.chunks[-1][0] == stream:
+            self.chunks[-1][1].append(text)
+        else:
+            self.chunks.append((stream, [text]))
+        self.size += len(text)
+        if self.size > self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        for stream, texts in self.chunks:
+            _send(self.wfile, {stream: ''.join(texts)})
+        self.chunks = []
+        self.size = 0
+
+
+class _Stream(object):
+    """A file-like object that writes to one stream of an _Output."""
+
+    def __init__(self, output, name):
+        self.output = output
+        self.name = name
+
+    def write(self, text):
+        if not isinstance(text, text_type):
+            text = text.decode('utf-8', 'replace')
+        self.output.write(self.name, text)
+
+    def flush(self):
+        self.output.flush()
+
+    def isatty(self):
+        return False
+
+
+class _StdinStream(object):
+    """The contents of the client's stdin, for requests that read it."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def read(self):
+        text, self.text = self.text, ''
+        return text
+
+    def __iter__(self):
+        return iter(self.read().splitlines(True))
+
+
+def _send(wfile, message):
+    wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+    wfile.flush()
+
+
+def _programs():
+    from libfuturize.main import main as futurize_main
+    from libpasteurize.main import main as pasteurize_main
+    return {'futurize': futurize_main, 'pasteurize': pasteurize_main}
+
+
+def _run(request, output):
+    """
+    Runs one futurize or pasteurize request with its output redirected.
+    Returns the exit status.
+    """
+    main = _programs()[request['program']]
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_cwd = os.getcwd()
+    # Let main() set up logging for this request; the handler it creates
+    # writes to the redirected stderr.
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers = []
+    sys.stdin = _StdinStream(request.get('stdin') or '')
+    sys.stdout = _Stream(output, 'stdout')
+    sys.stderr = _Stream(output, 'stderr')
+    try:
+        os.chdir(request['cwd'])
+        return main(request['args'])
+    except SystemExit as err:
+        if err.code is None or isinstance(err.code, int):
+            return err.code or 0
+        print(err.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        os.chdir(saved_cwd)
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        root.handlers, root.level = saved_handlers, saved_level
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            # e.g. serve() checking whether this server is still running
+            return
+        request = json.loads(line.decode('utf-8'))
+        output = _Output(self.wfile)
+        status = _run(request, output)
+        output.flush()
+        _send(self.wfile, {'exit': status})
+
+
+def _remove_stale_socket(address):
+    """
+    Removes the socket at ``address``, left behind by a server that did not
+    shut down cleanly. Nothing is listening on it: connecting was refused.
+    """
+    try:
+        if stat.S_ISSOCK(os.stat(address).st_mode):
+            os.remove(address)
+    except OSError:
+        pass
+
+
+def serve(address):
+    """
+    Serves futurize and pasteurize requests on the Unix domain socket at
+    ``address`` until interrupted. Returns a suggested exit status.
+    """
+    from libfuturize.refactor import keep_tools_warm
+
+    if not hasattr(socketserver, 'UnixStreamServer'):
+        print("Sorry, --server isn't supported on this platform.",
+              file=sys.stderr)
+        return 1
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except socket.error as err:
+        if err.errno == errno.ECONNREFUSED:
+            _remove_stale_socket(address)
+    else:
+        print("A server is already listening on %s" % address,
+              file=sys.stderr)
+        return 1
+    finally:
+        sock.close()
+    # Requests must not be forwarded back to this server
+    os.environ.pop('FUTURIZE_SERVER', None)
+    keep_tools_warm()
+    _programs()
+    server = socketserver.UnixStreamServer(address, _RequestHandler)
+    print("Serving futurize and pasteurize requests on %s" % address,
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(address)
+    return 0
+
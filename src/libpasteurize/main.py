@@ -41,10 +41,13 @@ from __future__ import (absolute_import, print_function, unicode_literals)
 import sys
 import logging
 import optparse
-from lib2to3.main import main, warn, StdoutRefactoringTool
+from lib2to3.main import main, warn
 from lib2to3 import refactor
 
 from future import __version__
+from libfuturize.changes import select_files
+from libfuturize.refactor import refactoring_tool
+from libfuturize.server import serve
 from libpasteurize.fixes import fix_names
 
 
@@ -77,11 +80,26 @@ def main(args=None):
                       help="Write back modified files")
     parser.add_option("-n", "--nobackups", action="store_true", default=False,
                       help="Don't write backups for modified files.")
+    parser.add_option("--cache-dir", action="store", type="str", default="",
+                      help="Cache refactoring results in this directory and "
+                      "reuse them for files whose contents have not changed.")
+    parser.add_option("--changed-since", action="store", type="str",
+                      metavar="REV", help="Only refactor files that have "
+                      "been added or modified since this git revision.")
+    parser.add_option("--files-from", action="store", type="str",
+                      metavar="FILE", help="Only refactor the files listed "
+                      "(one per line) in FILE, or on stdin if FILE is '-'.")
+    parser.add_option("--server", action="store", type="str",
+                      metavar="SOCKET", help="Keep running and serve "
+                      "futurize and pasteurize requests on this Unix socket. "
+                      "Set FUTURIZE_SERVER=SOCKET to send requests to it.")
 
     # Parse command line arguments
     refactor_stdin = False
     flags = {}
     options, args = parser.parse_args(args)
+    if options.server:
+        return serve(options.server)
     fixer_pkg = 'libpasteurize.fixes'
     avail_fixes = fix_names
     flags["print_function"] = True
@@ -99,16 +117,18 @@ def main(args=None):
             print(fixname)
         if not args:
             return 0
-    if not args:
-        print("At least one file or directory argument required.",
-              file=sys.stderr)
-        print("Use --help to show usage.", file=sys.stderr)
-        return 2
     if "-" in args:
         refactor_stdin = True
         if options.write:
             print("Can't write to stdin.", file=sys.stderr)
             return 2
+        if options.changed_since or options.files_from:
+            print("Can't use --changed-since or --files-from with stdin.",
+                  file=sys.stderr)
+            return 2
+    items = select_files(options, args)
+    if items is None:
+        return 2
 
     # Set up logging handler
     level = logging.DEBUG if options.verbose else logging.INFO
@@ -182,8 +202,9 @@ def main(args=None):
     fixer_names = requested | extra_fixes - unwanted_fixes
 
     # Initialize the refactoring tool
-    rt = StdoutRefactoringTool(sorted(fixer_names), flags, set(),
-                               options.nobackups, not options.no_diffs)
+    rt = refactoring_tool(sorted(fixer_names), flags, set(),
+                          options.nobackups, not options.no_diffs,
+                          cache_dir=options.cache_dir)
 
     # Refactor all files and directories passed as arguments
     if not rt.errors:
@@ -191,7 +212,7 @@ def main(args=None):
             rt.refactor_stdin()
         else:
             try:
-                rt.refactor(args, options.write, None,
+                rt.refactor(items, options.write, None,
                             options.processes)
             except refactor.MultiprocessingUnsupported:
                 assert options.processes > 1
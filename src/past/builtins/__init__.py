@@ -29,7 +29,11 @@ This module provides the following:
 - range
 - zip
 
-4. Forward-ported Py2 types:
+4. A sorting helper (not a builtin, so it is not in ``__all__``):
+
+- sort_cmp
+
+5. Forward-ported Py2 types:
 
 - basestring
 - dict
@@ -52,7 +56,8 @@ else:
     from __builtin__ import (basestring, dict, str, long, unicode)
 
 from past.builtins.misc import (apply, chr, cmp, execfile, intern, oct,
-                                raw_input, reload, unichr, unicode, xrange)
+                                raw_input, reload, sort_cmp, unichr, unicode,
+                                xrange)
 from past import utils
 
 
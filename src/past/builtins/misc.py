@@ -16,6 +16,7 @@ else:
 if PY3:
     import builtins
     from collections.abc import Mapping
+    from functools import cmp_to_key
 
     def apply(f, *args, **kw):
         return f(*args, **kw)
@@ -36,6 +37,21 @@ if PY3:
         Python2 had looser comparison allowing cmp None and non Numerical types and collections.
         Try to match the old behavior
         """
+        return _cmp_dispatch.get((type(x), type(y)), _cmp_any)(x, y)
+
+    def _cmp_ordered(x, y):
+        # Both of a type for which Py3's ordering is Py2's
+        return (x > y) - (x < y)
+
+    def _cmp_numbers(x, y):
+        # Both int, bool or float: only NaN needs special handling
+        if x != x:
+            return 1 if isinstance(y, int) else -1
+        if y != y:
+            return -1 if isinstance(x, int) else 1
+        return (x > y) - (x < y)
+
+    def _cmp_any(x, y):
         if isinstance(x, set) and isinstance(y, set):
             raise TypeError('cannot compare sets using cmp()',)
         try:
@@ -95,6 +111,59 @@ if PY3:
                             return cmp(x[x_key], y[y_key])
             return cmp(x_type_index, y_type_index)
 
+    # The comparison to use for each (type(x), type(y)), looked up before
+    # falling back to the general rules in _cmp_any. Only exact types are
+    # listed, since subclasses may override the comparison methods.
+    _cmp_dispatch = {}
+    for _x_type in (int, bool, float):
+        for _y_type in (int, bool, float):
+            if float in (_x_type, _y_type):
+                _cmp_dispatch[_x_type, _y_type] = _cmp_numbers
+            else:
+                _cmp_dispatch[_x_type, _y_type] = _cmp_ordered
+    _cmp_dispatch[str, str] = _cmp_ordered
+    _cmp_dispatch[bytes, bytes] = _cmp_ordered
+    del _x_type, _y_type
+
+    def sort_cmp(iterable, key=None, reverse=False):
+        """
+        sort_cmp(iterable, key=None, reverse=False) -> new sorted list
+
+        Like sorted(), but orders the items as Python 2 did, i.e. as
+        sorted(iterable, key=cmp_to_key(cmp)) does with the cmp() above.
+
+        The keys are computed once. If they are all of one type that Py3
+        orders the same way as Py2 (int, float, bool, str or bytes, without
+        NaNs), they are sorted directly rather than through cmp().
+        """
+        items = list(iterable)
+        keys = items if key is None else [key(item) for item in items]
+        if _sorts_like_cmp(keys):
+            sort_key = None
+        else:
+            sort_key = cmp_to_key(cmp)
+        if key is None:
+            return sorted(items, key=sort_key, reverse=reverse)
+        if sort_key is not None:
+            keys = [sort_key(k) for k in keys]
+        order = sorted(range(len(items)), key=keys.__getitem__,
+                       reverse=reverse)
+        return [items[i] for i in order]
+
+    def _sorts_like_cmp(keys):
+        """
+        Returns True if sorted(keys) gives the same order as sorting them
+        with cmp().
+        """
+        key_types = set(map(type, keys))
+        if len(key_types) == 1 and (str in key_types or bytes in key_types):
+            return True
+        if key_types <= _number_types:
+            return float not in key_types or all(k == k for k in keys)
+        return False
+
+    _number_types = frozenset([int, bool, float])
+
     from sys import intern
 
     def oct(number):
@@ -129,6 +198,10 @@ else:
     unichr = __builtin__.unichr
     xrange = __builtin__.xrange
 
+    def sort_cmp(iterable, key=None, reverse=False):
+        # Python 2's sorted() already orders items as cmp() does
+        return sorted(iterable, key=key, reverse=reverse)
+
 
 if PY3:
     def execfile(filename, myglobals=None, mylocals=None):
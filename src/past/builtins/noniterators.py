@@ -15,20 +15,175 @@ The list-producing functions this brings in are::
 - ``reduce``
 - ``zip``
 
+For large inputs, ``lazymap``, ``lazyfilter`` and ``lazyzip`` can be imported
+from this module instead. They return a ``lazylist``, which supports the
+list operations but only computes each item when it is first needed.
+
 """
 
 from __future__ import division, absolute_import, print_function
 
-from itertools import chain, starmap
+from itertools import chain, islice, starmap
 import itertools       # since zip_longest doesn't exist on Py2
 from past.types import basestring
 from past.utils import PY3
 
+if PY3:
+    from collections.abc import MutableSequence
+else:
+    from collections import MutableSequence
+
 
 def flatmap(f, items):
     return chain.from_iterable(map(f, items))
 
 
+class lazylist(MutableSequence):
+    """
+    A list-like sequence whose items are computed from an iterable only when
+    they are first needed. For example, lazylist(map(f, items))[0] calls f
+    only once.
+
+    Iterating, indexing with a non-negative int, ``bool()`` and ``in`` only
+    compute the items they need. Other operations, such as ``len()``,
+    negative indexes, slicing, comparisons and any change to the list,
+    compute all the remaining items first. Slicing, ``+`` and ``*`` return
+    plain lists.
+
+    Note that a lazylist is not an instance of ``list``. To pass one to code
+    that requires a list, use ``list(mylazylist)``.
+    """
+    def __init__(self, iterable=()):
+        self._items = []
+        self._iterator = iter(iterable)
+
+    def _fill(self, index):
+        """
+        Computes the items up to and including the one at index, if there
+        are that many.
+        """
+        iterator = self._iterator
+        if iterator is not None and index >= len(self._items):
+            self._items.extend(islice(iterator, index + 1 - len(self._items)))
+            if index >= len(self._items):
+                self._iterator = None
+
+    def _list(self):
+        """
+        Computes all the remaining items and returns the list of all items.
+        """
+        if self._iterator is not None:
+            self._items.extend(self._iterator)
+            self._iterator = None
+        return self._items
+
+    def __iter__(self):
+        items = self._items
+        i = 0
+        while True:
+            if i >= len(items):
+                self._fill(i)
+                if i >= len(items):
+                    return
+            yield items[i]
+            i += 1
+
+    def __len__(self):
+        return len(self._list())
+
+    def __bool__(self):
+        self._fill(0)
+        return bool(self._items)
+
+    __nonzero__ = __bool__
+
+    def __contains__(self, value):
+        for item in self:
+            if item is value or item == value:
+                return True
+        return False
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            self._fill(index)
+            return self._items[index]
+        return self._list()[index]
+
+    def __setitem__(self, index, value):
+        self._list()[index] = value
+
+    def __delitem__(self, index):
+        del self._list()[index]
+
+    def insert(self, index, value):
+        self._list().insert(index, value)
+
+    def append(self, value):
+        self._list().append(value)
+
+    def extend(self, values):
+        self._list().extend(values)
+
+    def __iadd__(self, values):
+        self._list().extend(values)
+        return self
+
+    def index(self, value, *args):
+        return self._list().index(value, *args)
+
+    def count(self, value):
+        return self._list().count(value)
+
+    def sort(self, *args, **kwargs):
+        self._list().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._list().reverse()
+
+    def __reversed__(self):
+        return reversed(self._list())
+
+    def __add__(self, other):
+        return self._list() + _as_list(other)
+
+    def __radd__(self, other):
+        return _as_list(other) + self._list()
+
+    def __mul__(self, n):
+        return self._list() * n
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        return self._list() == _as_list(other)
+
+    def __ne__(self, other):
+        return self._list() != _as_list(other)
+
+    def __lt__(self, other):
+        return self._list() < _as_list(other)
+
+    def __le__(self, other):
+        return self._list() <= _as_list(other)
+
+    def __gt__(self, other):
+        return self._list() > _as_list(other)
+
+    def __ge__(self, other):
+        return self._list() >= _as_list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._list())
+
+
+def _as_list(obj):
+    if isinstance(obj, lazylist):
+        return obj._list()
+    return obj
+
+
 if PY3:
     import builtins
 
@@ -74,24 +229,24 @@ if PY3:
 
         More test cases are in test_past.test_builtins.
         """
+        return list(_oldmap_iter(func, *iterables))
+
+    def _oldmap_iter(func, *iterables):
+        """
+        Returns an iterator over the items of oldmap(func, *iterables), so
+        that the result list is built in one pass with no intermediate list.
+        """
+        if len(iterables) == 0:
+            raise TypeError('map() requires at least two args')
+        if len(iterables) == 1:
+            # map(None, S) is the same as list(S)
+            if func is None:
+                return iter(iterables[0])
+            return builtins.map(func, iterables[0])
         zipped = itertools.zip_longest(*iterables)
-        l = list(zipped)
-        if len(l) == 0:
-            return []
         if func is None:
-            result = l
-        else:
-            result = list(starmap(func, l))
-
-        # Inspect to see whether it's a simple sequence of tuples
-        try:
-            if max([len(item) for item in result]) == 1:
-                return list(chain.from_iterable(result))
-            # return list(flatmap(func, result))
-        except TypeError as e:
-            # Simple objects like ints have no len()
-            pass
-        return result
+            return zipped
+        return starmap(func, zipped)
 
         ############################
         ### For reference, the source code for Py2.7 map function:
@@ -254,6 +409,28 @@ if PY3:
     def oldzip(*args, **kwargs):
         return list(builtins.zip(*args, **kwargs))
 
+    def lazymap(func, *iterables):
+        """
+        Like map() from Python 2, but returns a lazylist, which calls func
+        only as the items are needed.
+        """
+        return lazylist(_oldmap_iter(func, *iterables))
+
+    def lazyfilter(function, iterable):
+        """
+        Like filter() from Python 2, but returns a lazylist, which calls
+        function only as the items are needed. Unlike filter(), this returns
+        a lazylist for strings and tuples too.
+        """
+        return lazylist(builtins.filter(function, iterable))
+
+    def lazyzip(*iterables):
+        """
+        Like zip() from Python 2, but returns a lazylist, which pairs up the
+        items only as they are needed.
+        """
+        return lazylist(builtins.zip(*iterables))
+
     filter = oldfilter
     map = oldmap
     range = oldrange
@@ -269,4 +446,8 @@ else:
     range = __builtin__.range
     reduce = __builtin__.reduce
     zip = __builtin__.zip
+    # These already produce lists on Py2
+    lazymap = map
+    lazyfilter = filter
+    lazyzip = zip
     __all__ = []
@@ -28,22 +28,52 @@ You can unregister the hook using::
     >>> from past.translation import remove_hooks
     >>> remove_hooks()
 
+Modules that use syntax only available in Python 3, such as f-strings or
+``nonlocal``, are imported unchanged. All other modules are translated.
+
+Translated modules are cached as bytecode in the ``__pycache__`` directory next
+to the source (e.g. ``mymodule.cpython-311.opt-past.pyc``, or
+``mymodule.cpython-311.opt-past1.pyc`` under ``python -O``), so later imports of
+an unchanged module skip the translation. The cache is keyed by a hash of the
+source and of the fixers used, and is not written if ``sys.dont_write_bytecode``
+is set.
+
+To fill the cache ahead of time, e.g. when deploying, use::
+
+    >>> from past.translation import pretranslate
+    >>> pretranslate(['mypackage1', 'mypackage2'], workers=4)
+
+or from the command line::
+
+    $ python -m past.translation -j 4 mypackage1 mypackage2
+
+To see which translated modules take longest to import, call
+``past.translation.print_stats()`` or set the environment variable
+``PAST_TRANSLATION_STATS=1`` to print the timings at exit.
+
 Author: Ed Schofield.
 Inspired by and based on ``uprefix`` by Vinay M. Sajip.
 """
 
+import atexit
 import sys
 # imp was deprecated in python 3.6
 if sys.version_info >= (3, 6):
     import importlib as imp
 else:
     import imp
+import hashlib
+import io
 import logging
+import marshal
 import os
 import copy
+import time
+import tokenize
 from lib2to3.pgen2.parse import ParseError
 from lib2to3.refactor import RefactoringTool
 
+from future import __version__
 from libfuturize import fixes
 
 try:
@@ -55,6 +85,14 @@ except ImportError:
     PathFinder = None
     SourceFileLoader = object
 
+try:
+    from importlib.util import MAGIC_NUMBER, cache_from_source
+    # Check that cache_from_source() supports the optimization argument
+    # (Python >= 3.5)
+    cache_from_source('x.py', optimization='past')
+except (ImportError, TypeError, NotImplementedError):
+    cache_from_source = None
+
 if sys.version_info[:2] < (3, 4):
     import imp
 
@@ -218,18 +256,84 @@ def common_substring(s1, s2):
 # _stdlibprefix = common_substring(math.__file__, urllib.__file__)
 
 
-def detect_python2(source, pathname):
+# Tokens that only occur in Python 3 code. A module containing any of these is
+# left alone without being parsed by lib2to3. The quick substring check avoids
+# tokenizing modules that cannot contain them.
+_py3_only_substrings = ('nonlocal', 'async', '->', ':=', 'yield', 'f"', "f'",
+                        'F"', "F'")
+_py3_only_ops = frozenset(['->', ':=', '@='])
+_ignored_tokens = frozenset([tokenize.COMMENT, tokenize.NL])
+
+
+def _is_fstring_prefix(text):
+    prefix = text[:len(text) - len(text.lstrip('rRbBuUfF'))]
+    return 'f' in prefix.lower()
+
+
+def is_obviously_py3(source):
     """
-    Returns a bool indicating whether we think the code is Py2
+    Returns True if the source uses syntax that only exists in Python 3, such
+    as f-strings, ``nonlocal``, ``async def``, ``yield from``, function
+    annotations with ``->`` or assignment expressions. This looks only at the
+    tokens, so it is much cheaper than parsing the source with lib2to3.
+
+    A False result does not mean that the code is Python 2.
     """
-    RTs.setup_detect_python2()
+    if not any(s in source for s in _py3_only_substrings):
+        return False
+    previous = None
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+            toktype, text = tok[0], tok[1]
+            if toktype == tokenize.OP:
+                if text in _py3_only_ops:
+                    return True
+            elif toktype == tokenize.NAME:
+                if text == 'nonlocal':
+                    return True
+                if previous == 'async' and text in ('def', 'for', 'with'):
+                    return True
+                if previous == 'yield' and text == 'from':
+                    return True
+            elif toktype == tokenize.STRING:
+                if _is_fstring_prefix(text):
+                    return True
+            elif tokenize.tok_name.get(toktype) == 'FSTRING_START':
+                return True
+            if toktype not in _ignored_tokens:
+                previous = text
+    except (tokenize.TokenError, SyntaxError):
+        # Py2 source, e.g. with backticks or old octal literals, may not
+        # tokenize under Python 3
+        return False
+    return False
+
+
+def _refactor(rt, rtp, source, pathname):
+    """
+    Parses the source once with the refactoring tool ``rt``, or with ``rtp``
+    (which uses the grammar without the print statement) if it cannot be
+    parsed with the print statement, and runs its fixers over the tree.
+    """
+    # lib2to3 likes a newline at the end
+    source += '\n'
     try:
-        tree = RTs._rt_py2_detect.refactor_string(source, pathname)
+        return rt.refactor_string(source, pathname)
     except ParseError as e:
         if e.msg != 'bad input' or e.value != '=':
             raise
-        tree = RTs._rtp.refactor_string(source, pathname)
+        return rtp.refactor_string(source, pathname)
 
+
+def detect_python2(source, pathname):
+    """
+    Returns a bool indicating whether we think the code is Py2
+    """
+    if is_obviously_py3(source):
+        logger.debug('Detected Python 3 code: {0}'.format(pathname))
+        return False
+    RTs.setup_detect_python2()
+    tree = _refactor(RTs._rt_py2_detect, RTs._rtp_py2_detect, source, pathname)
     if source != str(tree)[:-1]:   # remove added newline
         # The above fixers made changes, so we conclude it's Python 2 code
         logger.debug('Detected Python 2 code: {0}'.format(pathname))
@@ -243,42 +347,260 @@ def transform(source, pathname):
     # This implementation uses lib2to3,
     # you can override and use something else
     # if that's better for you
-
-    # lib2to3 likes a newline at the end
     RTs.setup()
-    source += '\n'
-    try:
-        tree = RTs._rt.refactor_string(source, pathname)
-    except ParseError as e:
-        if e.msg != 'bad input' or e.value != '=':
-            raise
-        tree = RTs._rtp.refactor_string(source, pathname)
+    tree = _refactor(RTs._rt, RTs._rtp, source, pathname)
     # could optimise a bit for only doing str(tree) if
     # getattr(tree, 'was_changed', False) returns True
     return str(tree)[:-1]  # remove added newline
 
 
+def translate(source, pathname, record=None):
+    """
+    Returns the source of a module that is to be imported with the hooks,
+    translated from Python 2 if necessary.
+
+    Modules that are obviously Python 3 (see ``is_obviously_py3()``) are
+    returned unchanged without being parsed. All others are parsed once and
+    translated with ``transform()``. If a ``record`` dict from ``stats()`` is
+    given, the time taken by each step is stored in it.
+    """
+    start = _timer()
+    py3 = is_obviously_py3(source)
+    if record is not None:
+        record['detect'] = _timer() - start
+    if py3:
+        logger.debug('Not translating Python 3 code: {0}'.format(pathname))
+        return source
+    start = _timer()
+    source = transform(source, pathname)
+    if record is not None:
+        record['transform'] = _timer() - start
+    return source
+
+
+def _translation_cache_path(pathname):
+    """
+    Returns the path of the file in which to cache the translated bytecode for
+    the source file ``pathname``, or None if this is not supported.
+    """
+    if cache_from_source is None:
+        return None
+    # Code compiled with -O or -OO differs, so it is cached separately
+    tag = 'past'
+    if sys.flags.optimize:
+        tag += str(sys.flags.optimize)
+    try:
+        return cache_from_source(pathname, optimization=tag)
+    except (NotImplementedError, ValueError):
+        return None
+
+
+_fixers_hash = None
+
+
+def _translation_cache_header(data):
+    """
+    Returns the header identifying cached bytecode for the source bytes
+    ``data``: the interpreter's magic number followed by a hash of the source
+    and of everything that affects its translation.
+    """
+    global _fixers_hash
+    if _fixers_hash is None:
+        _fixers_hash = hashlib.sha256()
+        for part in [__version__] + sorted(myfixes) + sorted(py2_detect_fixers):
+            _fixers_hash.update(part.encode('utf-8') + b'\0')
+    h = _fixers_hash.copy()
+    h.update(data)
+    return MAGIC_NUMBER + h.digest()
+
+
+# Per-module timings of the import hooks, keyed by module name. See stats().
+_stats = {}
+_timer = time.perf_counter if hasattr(time, 'perf_counter') else time.time
+_stat_phases = ('find_spec', 'detect', 'transform', 'compile', 'exec')
+
+
+def _record(fullname):
+    try:
+        return _stats[fullname]
+    except KeyError:
+        record = _stats[fullname] = dict.fromkeys(_stat_phases, 0.0)
+        record['cached'] = False
+        return record
+
+
+def stats():
+    """
+    Returns the time spent by the import hooks on each translated module, as
+    a dict mapping module names to dicts with these keys:
+
+    - ``find_spec``: locating the module
+    - ``detect``: checking whether the module is obviously Py3
+    - ``transform``: translating the source with the fixers
+    - ``compile``: compiling the translated source
+    - ``exec``: running the module body, including any nested imports
+    - ``cached``: True if the translation came from the bytecode cache, in
+      which case ``detect``, ``transform`` and ``compile`` are 0
+
+    Times are in seconds.
+    """
+    return dict((fullname, dict(record)) for fullname, record in _stats.items())
+
+
+def reset_stats():
+    """
+    Discards the timings recorded so far.
+    """
+    _stats.clear()
+
+
+def print_stats(file=None, limit=None):
+    """
+    Prints a table of the timings returned by ``stats()`` to ``file``
+    (``sys.stderr`` by default), slowest modules first. If ``limit`` is
+    given, only that many modules are listed.
+    """
+    if file is None:
+        file = sys.stderr
+    records = sorted(_stats.items(), reverse=True,
+                     key=lambda item: sum(item[1][phase]
+                                          for phase in _stat_phases))
+    width = max([len('module')] + [len(name) for name, _ in records])
+    columns = ('find_spec', 'detect', 'transform', 'compile', 'exec', 'total')
+    file.write('past.translation timings (ms):\n')
+    file.write('%-*s %6s' % (width, 'module', 'cached') +
+               ''.join(' %9s' % column for column in columns) + '\n')
+    for fullname, record in records[:limit]:
+        times = [record[phase] for phase in _stat_phases]
+        times.append(sum(times))
+        file.write('%-*s %6s' % (width, fullname,
+                                 'yes' if record['cached'] else 'no') +
+                   ''.join(' %9.1f' % (t * 1000) for t in times) + '\n')
+
+
+_print_stats_registered = False
+
+
+def print_stats_at_exit(file=None, limit=None):
+    """
+    Arranges for ``print_stats()`` to be called when the interpreter exits.
+    Setting the environment variable ``PAST_TRANSLATION_STATS`` to a
+    non-empty value has the same effect.
+    """
+    global _print_stats_registered
+    if not _print_stats_registered:
+        _print_stats_registered = True
+        atexit.register(print_stats, file, limit)
+
+
+class _PrefixTrie(object):
+    """
+    A set of string prefixes that can be tested against a name in time
+    proportional to the length of the name, however many prefixes there are.
+    """
+
+    def __init__(self, prefixes):
+        self.root = {}
+        for prefix in prefixes:
+            node = self.root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[None] = True
+
+    def matches(self, name):
+        """
+        Returns True if any of the prefixes is a prefix of ``name``.
+        """
+        node = self.root
+        if None in node:
+            return True
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+
+class _PathFilter(object):
+    """
+    Decides which modules to translate, given the module name prefixes to
+    include and exclude. Exclusions take precedence. Decisions are memoised
+    by module name.
+    """
+
+    def __init__(self, include_paths, exclude_paths):
+        self.include = _PrefixTrie(include_paths)
+        self.exclude = _PrefixTrie(exclude_paths)
+        self.decisions = {}
+
+    def convert_needed(self, fullname):
+        try:
+            return self.decisions[fullname]
+        except KeyError:
+            convert = (not self.exclude.matches(fullname) and
+                       self.include.matches(fullname))
+            self.decisions[fullname] = convert
+            return convert
+
+
 class PastSourceFileLoader(SourceFileLoader):
     exclude_paths = []
     include_paths = []
+    # Set by Py2Fixer to share its memoised decisions
+    path_filter = None
 
     def _convert_needed(self):
-        fullname = self.name
-        if any(fullname.startswith(path) for path in self.exclude_paths):
-            convert = False
-        elif any(fullname.startswith(path) for path in self.include_paths):
-            convert = True
-        else:
-            convert = False
-        return convert
+        path_filter = self.path_filter
+        if path_filter is None:
+            path_filter = _PathFilter(self.include_paths, self.exclude_paths)
+        return path_filter.convert_needed(self.name)
 
     def _exec_transformed_module(self, module):
-        source = self.get_source(self.name)
+        code = self._get_transformed_code()
+        record = _record(self.name)
+        start = _timer()
+        try:
+            exec(code, module.__dict__)
+        finally:
+            record['exec'] += _timer() - start
+
+    def _get_transformed_code(self, write_cache=None):
+        """
+        Returns the module's code object, translated from Py2 if necessary.
+        The result is cached in ``__pycache__`` and reused while the source
+        and the fixers are unchanged. The cache is written unless
+        ``sys.dont_write_bytecode`` is set or ``write_cache`` is False.
+        """
         pathname = self.path
-        if detect_python2(source, pathname):
-            source = transform(source, pathname)
+        record = _record(self.name)
+        cache_path = _translation_cache_path(pathname)
+        if cache_path is not None:
+            header = _translation_cache_header(self.get_data(pathname))
+            try:
+                cached = self.get_data(cache_path)
+            except OSError:
+                pass
+            else:
+                if cached[:len(header)] == header:
+                    try:
+                        code = marshal.loads(cached[len(header):])
+                    except (EOFError, ValueError, TypeError):
+                        pass
+                    else:
+                        logger.debug('Using cached translation of %s', pathname)
+                        record['cached'] = True
+                        return code
+        source = translate(self.get_source(self.name), pathname, record)
+        start = _timer()
         code = compile(source, pathname, "exec")
-        exec(code, module.__dict__)
+        record['compile'] = _timer() - start
+        if write_cache is None:
+            write_cache = not sys.dont_write_bytecode
+        if cache_path is not None and write_cache:
+            self.set_data(cache_path, header + marshal.dumps(code))
+        return code
 
     # For Python 3.3
     def load_module(self, fullname):
@@ -330,6 +652,7 @@ class Py2Fixer(object):
         self.base_exclude_paths = ['future', 'past']
         self.exclude_paths = copy.copy(self.base_exclude_paths)
         self.include_paths = []
+        self.path_filter = _PathFilter(self.include_paths, self.exclude_paths)
 
     def include(self, paths):
         """
@@ -338,6 +661,7 @@ class Py2Fixer(object):
         specify the module to be transformed from Py2 to Py3.
         """
         self.include_paths += paths
+        self.path_filter = _PathFilter(self.include_paths, self.exclude_paths)
 
     def exclude(self, paths):
         """
@@ -346,34 +670,151 @@ class Py2Fixer(object):
         the module not to undergo any source transformation.
         """
         self.exclude_paths += paths
+        self.path_filter = _PathFilter(self.include_paths, self.exclude_paths)
+
+    def _setup_loader(self, loader):
+        loader.__class__ = PastSourceFileLoader
+        loader.exclude_paths = self.exclude_paths
+        loader.include_paths = self.include_paths
+        loader.path_filter = self.path_filter
 
     # For Python 3.3
     def find_module(self, fullname, path=None):
         logger.debug("Running find_module: (%s, %s)", fullname, path)
+        if not self.path_filter.convert_needed(fullname):
+            # Leave the module to the other finders
+            return None
         loader = PathFinder.find_module(fullname, path)
         if not loader:
             logger.debug("Py2Fixer could not find %s", fullname)
             return None
-        loader.__class__ = PastSourceFileLoader
-        loader.exclude_paths = self.exclude_paths
-        loader.include_paths = self.include_paths
+        self._setup_loader(loader)
         return loader
 
     # For Python >=3.4
     def find_spec(self, fullname, path=None, target=None):
         logger.debug("Running find_spec: (%s, %s, %s)", fullname, path, target)
+        if not self.path_filter.convert_needed(fullname):
+            # Leave the module to the other finders
+            return None
+        start = _timer()
         spec = PathFinder.find_spec(fullname, path, target)
         if not spec:
             logger.debug("Py2Fixer could not find %s", fullname)
             return None
-        spec.loader.__class__ = PastSourceFileLoader
-        spec.loader.exclude_paths = self.exclude_paths
-        spec.loader.include_paths = self.include_paths
+        _record(fullname)['find_spec'] += _timer() - start
+        self._setup_loader(spec.loader)
         return spec
 
 
 _hook = Py2Fixer()
 
+if os.environ.get('PAST_TRANSLATION_STATS'):
+    print_stats_at_exit()
+
+
+def _find_module_spec(name):
+    """
+    Finds the spec for the module ``name`` without importing it or its
+    parent packages. Returns None if it cannot be found.
+    """
+    parts = name.split('.')
+    spec = PathFinder.find_spec(parts[0])
+    for i in range(1, len(parts)):
+        if spec is None or spec.submodule_search_locations is None:
+            return None
+        spec = PathFinder.find_spec('.'.join(parts[:i + 1]),
+                                    spec.submodule_search_locations)
+    return spec
+
+
+def _module_files(name):
+    """
+    Yields (fullname, pathname) for the source file of the module ``name``
+    and, if it is a package, of all modules and subpackages below it.
+    """
+    spec = _find_module_spec(name)
+    if spec is None or not isinstance(spec.loader, SourceFileLoader):
+        logger.warning('No Python source found for %s', name)
+        return
+    yield name, spec.origin
+    for location in spec.submodule_search_locations or ():
+        for dirpath, dirnames, filenames in os.walk(location):
+            # Only descend into subpackages
+            dirnames[:] = sorted(d for d in dirnames if
+                                 os.path.isfile(os.path.join(dirpath, d,
+                                                             '__init__.py')))
+            relpath = os.path.relpath(dirpath, location)
+            prefix = name
+            if relpath != os.curdir:
+                prefix += '.' + relpath.replace(os.sep, '.')
+            for filename in sorted(filenames):
+                modname, ext = os.path.splitext(filename)
+                if ext != '.py':
+                    continue
+                if modname != '__init__':
+                    fullname = prefix + '.' + modname
+                elif relpath != os.curdir:
+                    fullname = prefix
+                else:
+                    continue    # the package itself, yielded above
+                yield fullname, os.path.join(dirpath, filename)
+
+
+def _pretranslate_module(args):
+    fullname, pathname, path_filter = args
+    if not path_filter.convert_needed(fullname):
+        return None
+    loader = PastSourceFileLoader(fullname, pathname)
+    loader._get_transformed_code(write_cache=True)
+    return pathname
+
+
+def pretranslate(paths=None, exclude_paths=(), workers=1):
+    """
+    Translates the modules that the import hooks would translate ahead of
+    time, so that later imports can use the translation cache instead of
+    running the fixers.
+
+    ``paths`` are module or package names as passed to ``install_hooks()``.
+    Packages are walked recursively. By default the names already passed to
+    ``install_hooks()`` are used. Modules excluded with ``exclude_paths`` or
+    by the hooks are skipped.
+
+    With ``workers`` greater than 1, modules are translated in that many
+    worker processes.
+
+    The cache is written even if ``sys.dont_write_bytecode`` is set. Returns
+    the list of source files translated (or found to be up to date).
+    """
+    if cache_from_source is None:
+        raise NotImplementedError('pretranslation requires Python 3.5 or later')
+    if paths is None:
+        paths = _hook.include_paths
+    elif isinstance(paths, str):
+        paths = (paths,)
+    if isinstance(exclude_paths, str):
+        exclude_paths = (exclude_paths,)
+    path_filter = _PathFilter(paths, _hook.exclude_paths + list(exclude_paths))
+    jobs = []
+    seen = set()
+    for name in paths:
+        for fullname, pathname in _module_files(name):
+            if pathname not in seen:
+                seen.add(pathname)
+                jobs.append((fullname, pathname, path_filter))
+    if workers > 1 and len(jobs) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(min(workers, len(jobs)))
+        try:
+            results = pool.map(_pretranslate_module, jobs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_pretranslate_module(job) for job in jobs]
+    return [pathname for pathname in results if pathname is not None]
+
 
 def install_hooks(include_paths=(), exclude_paths=()):
     if isinstance(include_paths, str):
@@ -0,0 +1,51 @@
+"""
+Translates Python 2 modules ahead of time to fill the cache used by the
+``past.translation`` import hooks. Usage::
+
+    $ python -m past.translation [-j N] [-x EXCLUDE] mypackage [...]
+
+The arguments are the module or package names that are passed to
+``install_hooks()``.
+"""
+
+from __future__ import absolute_import, print_function
+
+import optparse
+import sys
+
+from lib2to3.pgen2.parse import ParseError
+
+from past.translation import pretranslate
+
+
+def main(args=None):
+    parser = optparse.OptionParser(
+        usage="python -m past.translation [options] module_or_package ...")
+    parser.add_option("-j", "--processes", action="store", default=1,
+                      type="int", help="Run translation concurrently.")
+    parser.add_option("-x", "--exclude", action="append", default=[],
+                      help="Don't translate modules whose names start "
+                           "with this prefix.")
+    parser.add_option("-v", "--verbose", action="store_true",
+                      help="List the source files translated.")
+    options, args = parser.parse_args(args)
+    if not args:
+        parser.error("At least one module or package name is required.")
+    try:
+        paths = pretranslate(args, exclude_paths=options.exclude,
+                             workers=options.processes)
+    except NotImplementedError as err:
+        print(err, file=sys.stderr)
+        return 1
+    except (ParseError, SyntaxError, EnvironmentError) as err:
+        print("Error: %s" % err, file=sys.stderr)
+        return 1
+    if options.verbose:
+        for path in paths:
+            print(path)
+    print("Translated %d module(s)." % len(paths), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
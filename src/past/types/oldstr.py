@@ -110,10 +110,10 @@ class oldstr(with_metaclass(BaseOldStr, _builtin_bytes)):
         return s[1:]
 
     def __str__(self):
-        s = super(oldstr, self).__str__()   # e.g. "b'abc'" or "b'abc\\ndef'
-        # TODO: fix this:
-        assert s[:2] == "b'" and s[-1] == "'"
-        return unescape(s[2:-1])            # e.g. 'abc'    or 'abc\ndef'
+        # Each byte becomes the character with the same ordinal, e.g. 'abc'
+        # or 'abc\ndef'. This is what unescaping the repr would give, without
+        # the round trip.
+        return self.decode('latin-1')
 
     def __getitem__(self, y):
         if isinstance(y, Integral):
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""
+Measures how long the main entry points of ``future`` and ``past`` take to
+import, and how much memory they allocate, so that startup regressions in
+the compatibility shims can be caught.
+
+Each entry point is imported in a fresh interpreter:
+
+- *cold*: with an empty bytecode cache, so every module is compiled from
+  source, as on the first run after installation (Python 3.8+ only). This
+  includes compiling any standard library modules that are imported;
+- *warm*: with a populated bytecode cache, as on later runs.
+
+The installed copy of ``future`` is measured, so install the tree under test
+first, e.g. with ``pip install -e .``. The best time of ``--repeat`` runs is
+reported. Memory is the size of the blocks allocated by the import that are
+still alive afterwards, as measured by ``tracemalloc`` (Python 3.4+).
+
+Usage::
+
+    $ python tests/benchmarks/bench_imports.py --save baseline.json
+    $ # ... make changes ...
+    $ python tests/benchmarks/bench_imports.py --baseline baseline.json
+
+With ``--baseline``, the exit status is 1 if any measurement has grown by
+more than the tolerance. Results are printed as a table, or as JSON with
+``--json``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import optparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+# (name, statement)
+ENTRY_POINTS = [
+    ('future', 'import future'),
+    ('builtins *', 'from builtins import *'),
+    ('future.builtins', 'from future.builtins import (ascii, bytes, chr, '
+                        'dict, filter, hex, input, int, map, next, oct, open, '
+                        'pow, range, round, str, super, zip)'),
+    ('install_aliases', 'from future import standard_library; '
+                        'standard_library.install_aliases()'),
+    ('past.builtins', 'import past.builtins'),
+    ('future.types', 'import future.types'),
+]
+
+
+def backport_entry_points():
+    """
+    Returns an entry point for each package and module in future.backports.
+    """
+    import future.backports
+    backports_dir = os.path.dirname(future.backports.__file__)
+    entry_points = []
+    for name in sorted(os.listdir(backports_dir)):
+        path = os.path.join(backports_dir, name)
+        if name.endswith('.py') and name != '__init__.py':
+            name = name[:-3]
+        elif not os.path.isfile(os.path.join(path, '__init__.py')):
+            continue
+        modname = 'future.backports.' + name
+        entry_points.append((modname, 'import ' + modname))
+    return entry_points
+
+
+# Run in a fresh interpreter to measure one import. Prints a JSON object.
+CHILD_SCRIPT = r'''
+import json, sys, time
+timer = getattr(time, 'perf_counter', time.time)
+statement, trace = sys.argv[1], sys.argv[2] == '1'
+result = {}
+if trace:
+    import tracemalloc
+    tracemalloc.start()
+    exec(statement, {})
+    result['memory'] = tracemalloc.get_traced_memory()[0]
+else:
+    start = timer()
+    exec(statement, {})
+    result['time'] = timer() - start
+print(json.dumps(result))
+'''
+
+
+def run_child(statement, env, trace=False):
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHILD_SCRIPT, statement, '1' if trace else '0'],
+        env=env)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def child_env(pycache_prefix=None, write_bytecode=True):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    if not write_bytecode:
+        env['PYTHONDONTWRITEBYTECODE'] = '1'
+    if pycache_prefix is not None:
+        env['PYTHONPYCACHEPREFIX'] = pycache_prefix
+    return env
+
+
+def measure(statement, repeat):
+    """
+    Returns a dict with the cold and warm import times (in seconds) and the
+    memory (in bytes) for the given import statement.
+    """
+    result = {}
+    cache_dir = tempfile.mkdtemp(prefix='bench_imports_')
+    try:
+        if sys.version_info >= (3, 8):
+            cold = []
+            for i in range(repeat):
+                empty_dir = tempfile.mkdtemp(prefix='bench_imports_')
+                try:
+                    env = child_env(empty_dir, write_bytecode=False)
+                    cold.append(run_child(statement, env)['time'])
+                finally:
+                    shutil.rmtree(empty_dir)
+            result['cold'] = min(cold)
+            env = child_env(cache_dir)
+        else:
+            env = child_env()
+        # Populate the bytecode cache
+        run_child(statement, env)
+        result['warm'] = min(run_child(statement, env)['time']
+                             for i in range(repeat))
+        if sys.version_info >= (3, 4):
+            result['memory'] = run_child(statement, env, trace=True)['memory']
+    finally:
+        shutil.rmtree(cache_dir)
+    return result
+
+
+def compare(results, baseline, tolerance, min_time, min_memory):
+    """
+    Returns a list of (name, metric, old, new) for each measurement that
+    has grown by more than ``tolerance`` (a fraction) relative to
+    ``baseline``, ignoring differences below ``min_time`` seconds or
+    ``min_memory`` bytes.
+    """
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        old_metrics = baseline.get(name, {})
+        for metric, new in sorted(metrics.items()):
+            old = old_metrics.get(metric)
+            if old is None:
+                continue
+            floor = min_memory if metric == 'memory' else min_time
+            if new - old > max(old * tolerance, floor):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def format_value(metric, value):
+    if value is None:
+        return '-'
+    if metric == 'memory':
+        return '%.1f KiB' % (value / 1024)
+    return '%.1f ms' % (value * 1000)
+
+
+def print_table(results, baseline=None):
+    width = max(len(name) for name in results)
+    metrics = ['cold', 'warm', 'memory']
+    print('%-*s' % (width, 'entry point') +
+          ''.join('%14s' % metric for metric in metrics))
+    for name, values in sorted(results.items()):
+        line = '%-*s' % (width, name)
+        for metric in metrics:
+            line += '%14s' % format_value(metric, values.get(metric))
+        print(line)
+        if baseline and name in baseline:
+            line = '%-*s' % (width, '  baseline')
+            for metric in metrics:
+                line += '%14s' % format_value(metric,
+                                              baseline[name].get(metric))
+            print(line)
+
+
+def main(args=None):
+    parser = optparse.OptionParser(usage='%prog [options] [entry point ...]')
+    parser.add_option('-n', '--repeat', type='int', default=5,
+                      help='Number of timed runs per entry point '
+                           '(default: %default).')
+    parser.add_option('--no-backports', action='store_true',
+                      help="Don't measure the future.backports packages.")
+    parser.add_option('--json', action='store_true',
+                      help='Print the results as JSON.')
+    parser.add_option('--save', metavar='FILE',
+                      help='Write the results to FILE as JSON.')
+    parser.add_option('--baseline', metavar='FILE',
+                      help='Compare the results with those saved in FILE and '
+                           'exit with status 1 if any have regressed.')
+    parser.add_option('--tolerance', type='float', default=0.25,
+                      help='Fraction by which a measurement may exceed the '
+                           'baseline (default: %default).')
+    parser.add_option('--min-time', type='float', default=0.002,
+                      help='Ignore time differences below this many seconds '
+                           '(default: %default).')
+    parser.add_option('--min-memory', type='int', default=64 * 1024,
+                      help='Ignore memory differences below this many bytes '
+                           '(default: %default).')
+    options, names = parser.parse_args(args)
+
+    entry_points = list(ENTRY_POINTS)
+    if not options.no_backports:
+        entry_points += backport_entry_points()
+    if names:
+        entry_points = [(name, statement) for (name, statement) in entry_points
+                        if name in names]
+        if not entry_points:
+            parser.error('No matching entry points.')
+
+    results = {}
+    for name, statement in entry_points:
+        try:
+            results[name] = measure(statement, options.repeat)
+        except subprocess.CalledProcessError:
+            # e.g. a backport that needs a module missing on this platform
+            print('Could not import %s; skipping.' % name, file=sys.stderr)
+
+    if not results:
+        return 1
+
+    import future
+    output = {'python': '%d.%d.%d' % sys.version_info[:3],
+              'future': future.__version__,
+              'results': results}
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+
+    baseline = None
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)['results']
+
+    if options.json:
+        print(json.dumps(output, indent=2, sort_keys=True))
+    else:
+        print_table(results, baseline)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, options.tolerance,
+                              options.min_time, options.min_memory)
+        for name, metric, old, new in regressions:
+            print('Regression: %s %s: %s -> %s'
+                  % (name, metric, format_value(metric, old),
+                     format_value(metric, new)), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Measures how long ``str()`` of a ``past.types.oldstr`` takes for values of
+increasing size, to check that it scales linearly with the length of the
+value.
+
+For each size, the best time of ``--repeat`` runs is reported, along with
+the time per MiB. The exit status is 1 if the time per MiB for the largest
+size exceeds that for the smallest size by more than the tolerance.
+
+Usage::
+
+    $ python tests/benchmarks/bench_oldstr.py
+    $ python tests/benchmarks/bench_oldstr.py --sizes 1,4,16,64
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import optparse
+import sys
+import timeit
+
+MiB = 1024 * 1024
+
+
+def measure(size, repeat):
+    """
+    Returns the best time (in seconds) of str() of an oldstr of ``size``
+    bytes containing every byte value.
+    """
+    setup = ('from past.types.oldstr import oldstr\n'
+             's = oldstr(bytes(bytearray(range(256))) * (%d // 256))' % size)
+    return min(timeit.Timer('str(s)', setup).repeat(repeat, 1))
+
+
+def main(args=None):
+    parser = optparse.OptionParser(usage='%prog [options]')
+    parser.add_option('-n', '--repeat', type='int', default=5,
+                      help='Number of timed runs per size (default: %default).')
+    parser.add_option('--sizes', default='1,2,4,8,16',
+                      help='Comma-separated sizes in MiB (default: %default).')
+    parser.add_option('--tolerance', type='float', default=1.0,
+                      help='Fraction by which the time per MiB may grow from '
+                           'the smallest to the largest size '
+                           '(default: %default).')
+    options, args = parser.parse_args(args)
+    try:
+        sizes = sorted(int(size) for size in options.sizes.split(','))
+    except ValueError:
+        parser.error('--sizes must be a list of integers.')
+
+    per_mib = []
+    print('%10s%14s%14s' % ('size', 'time', 'per MiB'))
+    for size in sizes:
+        elapsed = measure(size * MiB, options.repeat)
+        per_mib.append(elapsed / size)
+        print('%6d MiB%11.1f ms%11.2f ms' % (size, elapsed * 1000,
+                                            per_mib[-1] * 1000))
+
+    if per_mib[-1] - per_mib[0] > per_mib[0] * options.tolerance:
+        print('Not linear: %.2f ms per MiB at %d MiB, %.2f ms at %d MiB'
+              % (per_mib[0] * 1000, sizes[0], per_mib[-1] * 1000, sizes[-1]),
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
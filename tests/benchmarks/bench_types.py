@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""
+Measures the cost of the backported types in ``future.types`` (``newint``,
+``newbytes``, ``newstr``, ``newrange``, ``newdict``, ``newlist`` and
+``newobject``) relative to the native types they stand in for, so that
+slowdowns in the compatibility types can be tracked over time.
+
+Each operation is timed once with the native type and once with the new
+type, with the same statement and the same number of loops. The best time
+of ``--repeat`` runs is reported, along with the ratio of the new time to
+the native time. The ratio is what is compared with a baseline, because it
+varies much less between machines than the absolute times do.
+
+The types are designed for Python 2; on Python 3 the operations that are
+not supported by a type are reported as ``n/a``.
+
+Usage::
+
+    $ python tests/benchmarks/bench_types.py --save baseline.json
+    $ # ... make changes ...
+    $ python tests/benchmarks/bench_types.py --baseline baseline.json
+
+With ``--baseline``, the exit status is 1 if any ratio has grown by more
+than the tolerance. The positional arguments restrict the run to the given
+types, e.g. ``bench_types.py newbytes newstr``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import optparse
+import sys
+import timeit
+
+PY3 = sys.version_info[0] >= 3
+
+
+# For each new type: (module, native type). The native type is the one
+# that the new type replaces on Python 2.
+TYPES = [
+    ('newint', 'future.types.newint', 'int' if PY3 else 'long'),
+    ('newbytes', 'future.types.newbytes', 'bytes'),
+    ('newstr', 'future.types.newstr', 'str' if PY3 else 'unicode'),
+    ('newrange', 'future.types.newrange', 'range' if PY3 else 'xrange'),
+    ('newdict', 'future.types.newdict', 'dict'),
+    ('newlist', 'future.types.newlist', 'list'),
+    ('newobject', 'future.types.newobject', 'object'),
+]
+
+# For each new type: (operation, setup, statement). ``T`` is bound to the
+# native type or the new type before the setup is run.
+OPERATIONS = {
+    'newint': [
+        ('construct', '', 'T(12345)'),
+        ('add', 'x = T(12345); y = T(678)', 'x + y'),
+        ('multiply', 'x = T(12345); y = T(678)', 'x * y'),
+        ('floordiv', 'x = T(12345); y = T(678)', 'x // y'),
+        ('compare', 'x = T(12345); y = T(678)', 'x < y'),
+        ('hash', 'x = T(12345)', 'hash(x)'),
+        ('isinstance', 'x = 12345', 'isinstance(x, T)'),
+    ],
+    'newbytes': [
+        ('construct', '', "T(b'abcdefgh')"),
+        ('index', "x = T(b'abcdefgh')", 'x[3]'),
+        ('slice', "x = T(b'abcdefgh')", 'x[2:6]'),
+        ('concatenate', "x = T(b'abcdefgh')", 'x + x'),
+        ('compare', "x = T(b'abcdefgh'); y = T(b'abcdefgi')", 'x == y'),
+        ('find', "x = T(b'abcdefgh')", "x.find(b'fg')"),
+        ('split', "x = T(b'ab cd ef gh')", "x.split(b' ')"),
+        ('iterate', "x = T(b'abcdefgh')", 'for c in x: pass'),
+        ('hash', "x = T(b'abcdefgh')", 'hash(x)'),
+        ('isinstance', "x = b'abcdefgh'", 'isinstance(x, T)'),
+    ],
+    'newstr': [
+        ('construct', '', "T(u'abcdefgh')"),
+        ('index', "x = T(u'abcdefgh')", 'x[3]'),
+        ('slice', "x = T(u'abcdefgh')", 'x[2:6]'),
+        ('concatenate', "x = T(u'abcdefgh')", 'x + x'),
+        ('compare', "x = T(u'abcdefgh'); y = T(u'abcdefgi')", 'x == y'),
+        ('find', "x = T(u'abcdefgh')", "x.find(u'fg')"),
+        ('split', "x = T(u'ab cd ef gh')", "x.split(u' ')"),
+        ('iterate', "x = T(u'abcdefgh')", 'for c in x: pass'),
+        ('hash', "x = T(u'abcdefgh')", 'hash(x)'),
+        ('isinstance', "x = u'abcdefgh'", 'isinstance(x, T)'),
+    ],
+    'newrange': [
+        ('construct', '', 'T(100)'),
+        ('index', 'x = T(100)', 'x[50]'),
+        ('slice', 'x = T(100)', 'x[10:50]'),
+        ('contains', 'x = T(100)', '50 in x'),
+        ('iterate', 'x = T(100)', 'for i in x: pass'),
+        ('isinstance', 'x = T(100)', 'isinstance(x, T)'),
+    ],
+    'newdict': [
+        ('construct', '', 'T(a=1, b=2)'),
+        ('getitem', "x = T(a=1, b=2)", "x['a']"),
+        ('setitem', "x = T(a=1, b=2)", "x['c'] = 3"),
+        ('compare', "x = T(a=1, b=2); y = T(a=1, b=3)", 'x == y'),
+        ('iterate', "x = T(a=1, b=2)", 'for k, v in x.items(): pass'),
+        ('isinstance', "x = {'a': 1}", 'isinstance(x, T)'),
+    ],
+    'newlist': [
+        ('construct', '', 'T([1, 2, 3])'),
+        ('index', 'x = T([1, 2, 3])', 'x[1]'),
+        ('slice', 'x = T([1, 2, 3])', 'x[1:3]'),
+        ('concatenate', 'x = T([1, 2, 3])', 'x + x'),
+        ('compare', 'x = T([1, 2, 3]); y = T([1, 2, 4])', 'x == y'),
+        ('iterate', 'x = T([1, 2, 3])', 'for i in x: pass'),
+        ('isinstance', 'x = [1, 2, 3]', 'isinstance(x, T)'),
+    ],
+    'newobject': [
+        ('construct', 'class C(T): pass', 'C()'),
+        ('getattr', 'class C(T): pass\nx = C(); x.a = 1', 'x.a'),
+        ('bool', 'class C(T): pass\nx = C()', 'bool(x)'),
+        ('compare', 'class C(T): pass\nx = C()', 'x == x'),
+        ('hash', 'class C(T): pass\nx = C()', 'hash(x)'),
+        ('isinstance', 'class C(T): pass\nx = C()', 'isinstance(x, T)'),
+    ],
+}
+
+
+def calibrate(timer, min_time):
+    """
+    Returns a number of loops for which ``timer`` takes at least
+    ``min_time`` seconds.
+    """
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            return number
+        number *= 10
+
+
+def measure(module, native, setup, statement, repeat, min_time):
+    """
+    Returns a dict with the time per loop (in seconds) of ``statement``
+    with ``T`` bound to the native type and to the new type, and the ratio
+    of the two. The new time and the ratio are None if the new type does
+    not support the statement.
+    """
+    name = module.rsplit('.', 1)[1]
+    native_timer = timeit.Timer(statement, 'T = %s\n%s' % (native, setup))
+    new_timer = timeit.Timer(statement, 'from %s import %s as T\n%s'
+                                        % (module, name, setup))
+    number = calibrate(native_timer, min_time)
+    result = {'native': min(native_timer.repeat(repeat, number)) / number,
+              'new': None, 'ratio': None}
+    try:
+        new = min(new_timer.repeat(repeat, number)) / number
+    except Exception:
+        return result
+    result['new'] = new
+    result['ratio'] = new / result['native']
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a list of (name, old ratio, new ratio) for each operation whose
+    ratio has grown by more than ``tolerance`` (a fraction) relative to
+    ``baseline``.
+    """
+    regressions = []
+    for name, values in sorted(results.items()):
+        new = values['ratio']
+        old = baseline.get(name, {}).get('ratio')
+        if old is None or new is None:
+            continue
+        if new - old > old * tolerance:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def format_time(value):
+    if value is None:
+        return 'n/a'
+    return '%.0f ns' % (value * 1e9)
+
+
+def format_ratio(value):
+    if value is None:
+        return 'n/a'
+    return '%.2fx' % value
+
+
+def print_table(results, baseline=None):
+    width = max(len(name) for name in results)
+    columns = ['native', 'new', 'ratio']
+    if baseline:
+        columns.append('baseline')
+    print('%-*s' % (width, 'operation') +
+          ''.join('%12s' % column for column in columns))
+    for name, values in sorted(results.items()):
+        line = '%-*s' % (width, name)
+        line += '%12s' % format_time(values['native'])
+        line += '%12s' % format_time(values['new'])
+        line += '%12s' % format_ratio(values['ratio'])
+        if baseline:
+            line += '%12s' % format_ratio(baseline.get(name, {}).get('ratio'))
+        print(line)
+
+
+def main(args=None):
+    parser = optparse.OptionParser(usage='%prog [options] [type ...]')
+    parser.add_option('-n', '--repeat', type='int', default=5,
+                      help='Number of timed runs per operation '
+                           '(default: %default).')
+    parser.add_option('--min-time', type='float', default=0.05,
+                      help='Minimum duration of each timed run, in seconds '
+                           '(default: %default).')
+    parser.add_option('--json', action='store_true',
+                      help='Print the results as JSON.')
+    parser.add_option('--save', metavar='FILE',
+                      help='Write the results to FILE as JSON.')
+    parser.add_option('--baseline', metavar='FILE',
+                      help='Compare the results with those saved in FILE and '
+                           'exit with status 1 if any ratio has regressed.')
+    parser.add_option('--tolerance', type='float', default=0.25,
+                      help='Fraction by which a ratio may exceed the '
+                           'baseline (default: %default).')
+    options, names = parser.parse_args(args)
+
+    types = TYPES
+    if names:
+        types = [t for t in TYPES if t[0] in names]
+        if not types:
+            parser.error('No matching types.')
+
+    results = {}
+    for name, module, native in types:
+        for operation, setup, statement in OPERATIONS[name]:
+            results['%s.%s' % (name, operation)] = measure(
+                module, native, setup, statement, options.repeat,
+                options.min_time)
+
+    import future
+    output = {'python': '%d.%d.%d' % sys.version_info[:3],
+              'future': future.__version__,
+              'results': results}
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+
+    baseline = None
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)['results']
+
+    if options.json:
+        print(json.dumps(output, indent=2, sort_keys=True))
+    else:
+        print_table(results, baseline)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, options.tolerance)
+        for name, old, new in regressions:
+            print('Regression: %s: %s -> %s'
+                  % (name, format_ratio(old), format_ratio(new)),
+                  file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -159,6 +159,65 @@ class TestBuiltins(unittest.TestCase):
         self.assertEqual(round(123.551, -2), 100.0)
         self.assertEqual(round(123.551, -3), 0.0)
 
+    def test_round_float_fast_path(self):
+        """
+        The float fast path of newround() should agree with rounding the
+        exact value of the float with the decimal module.
+        """
+        from decimal import Context, Decimal, ROUND_HALF_EVEN
+        from math import copysign
+        from future.builtins.newround import _round_float
+        context = Context(prec=1000)
+        values = [0.0, -0.0, 0.5, 1.5, 2.5, -2.5, 0.125, 0.135, 2.675,
+                  12.35, 123.5, 123.551, -123.551, 1e16 + 2, 1e300, 5e-324,
+                  0.1, 1 / 3, -7 / 3]
+        for x in values:
+            for ndigits in range(-5, 18):
+                exponent = Decimal(1).scaleb(-ndigits)
+                expected = float(Decimal.from_float(x).quantize(
+                    exponent, rounding=ROUND_HALF_EVEN, context=context))
+                result = _round_float(x, ndigits)
+                self.assertEqual(result, expected, (x, ndigits))
+                self.assertEqual(copysign(1, result), copysign(1, expected),
+                                 (x, ndigits))
+
+    def test_newround_sequence(self):
+        from future.builtins.newround import newround_sequence
+        self.assertEqual(newround_sequence([0.5, 1.5, 2.5, -0.5, 3]),
+                         [0, 2, 2, 0, 3])
+        self.assertTrue(all(isinstance(x, Integral)
+                            for x in newround_sequence((0.5, 1.5, 7))))
+        self.assertEqual(newround_sequence([0.125, 2.675, 12.35], 2),
+                         [0.12, 2.67, 12.35])
+        self.assertEqual(newround_sequence([123.5, 10.135], -1), [120.0, 10.0])
+        self.assertEqual(newround_sequence(iter([1.25]), 1), [1.2])
+        self.assertEqual(newround_sequence([], 3), [])
+
+    def test_new_min_max(self):
+        """
+        Tests the backports of min() and max() used before Python 3.4
+        directly, so that they are also tested on later versions.
+        """
+        from future.builtins.new_min_max import newmax, newmin
+        self.assertEqual(newmax([3, 1, 2]), 3)
+        self.assertEqual(newmin(3, 1, 2), 1)
+        self.assertEqual(newmax([-3, 1, 2], key=abs), -3)
+        self.assertEqual(newmin([-3, 1, 2], key=None), -3)
+        self.assertEqual(newmax([], default=5), 5)
+        self.assertIs(newmin(iter([]), default=None), None)
+        self.assertEqual(newmin((x for x in [4, -5, 6]), key=abs,
+                                default=0), 4)
+        # The first of several maximal items is returned
+        self.assertEqual(newmax([(1, 'a'), (1, 'b')], key=lambda t: t[0],
+                                default=None), (1, 'a'))
+        self.assertRaises(TypeError, newmax)
+        self.assertRaises(TypeError, newmax, 42)
+        self.assertRaises(ValueError, newmin, [])
+        self.assertRaises(ValueError, newmin, [], key=abs)
+        self.assertRaises(TypeError, newmax, 1, 2, default=0)
+        self.assertRaises(TypeError, newmin, [1], foo=2)
+        self.assertRaises(TypeError, newmin, [1], default=0, foo=2)
+
     def test_newnext_doc_example(self):
         # Python 3-style iterator:
         class Upper(object):
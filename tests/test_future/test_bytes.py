@@ -512,6 +512,47 @@ class TestBytes(unittest.TestCase):
         self.assertFalse(hasattr(b, 'encode'))
         self.assertTrue(hasattr(b, 'decode'))
 
+    def test_newbytes_hasattr_encode(self):
+        from future.types.newbytes import newbytes
+        b = newbytes(b'abcd')
+        self.assertFalse(hasattr(b, 'encode'))
+        self.assertFalse(hasattr(newbytes, 'encode'))
+        with self.assertRaises(AttributeError) as cm:
+            b.encode('utf-8')
+        self.assertIn('disabled in newbytes', str(cm.exception))
+        self.assertEqual(b.decode('ascii'), u'abcd')
+        self.assertEqual(b.upper(), b'ABCD')
+
+    def test_newbytes_slicing_and_search(self):
+        from future.types.newbytes import newbytes
+        b = newbytes(b'key: value\r\nother: 1\r\n')
+        self.assertEqual(type(b[0:3]), newbytes)
+        self.assertEqual(b[0:3], b'key')
+        self.assertEqual(b[0], ord('k'))
+        self.assertTrue(ord(':') in b)
+        self.assertFalse(0 in b)
+        self.assertTrue(b'value' in b)
+        self.assertTrue(newbytes(b'other') in b)
+        self.assertFalse(b'missing' in b)
+        with self.assertRaises(ValueError):
+            256 in b
+        self.assertEqual(b.find(ord(':')), 3)
+        self.assertEqual(b.find(ord(':'), 4), 17)
+        self.assertEqual(b.rfind(ord(':')), 17)
+        self.assertEqual(b.index(ord('\r'), 4), 10)
+        self.assertEqual(b.rindex(b'\r\n'), 20)
+        with self.assertRaises(ValueError):
+            b.index(ord('z'))
+        parts = b.split(b'\r\n')
+        self.assertEqual(parts, [b'key: value', b'other: 1', b''])
+        self.assertTrue(all(type(part) == newbytes for part in parts))
+        head, sep, tail = b.partition(b': ')
+        self.assertEqual((head, sep), (b'key', b': '))
+        self.assertEqual(type(tail), newbytes)
+        joined = newbytes(b', ').join(parts[:2])
+        self.assertEqual(joined, b'key: value, other: 1')
+        self.assertEqual(type(joined), newbytes)
+
     def test_quote_from_bytes(self):
         """
         This test was failing in the backported urllib.parse module in quote_from_bytes
@@ -782,5 +823,43 @@ class TestBytes(unittest.TestCase):
         self.assertEqual(bytes(TestObject()), b'asdf')
 
 
+class TestDisallowTypes(unittest.TestCase):
+    """
+    Tests for the decorator that the new types use to reject arguments of
+    the wrong string type.
+    """
+
+    def test_disallow_types(self):
+        from future.types import disallow_types
+
+        # The native int; future.builtins rebinds int to newint on Py2
+        @disallow_types([0, 2], [type(0), float])
+        def f(a, b=None, c=None):
+            return 'ok'
+
+        self.assertEqual(f.__name__, 'f')
+        self.assertEqual(f(1.5, 1, 1), 'ok')
+        self.assertEqual(f(1.5), 'ok')
+        self.assertEqual(f(1.5, c=2.5), 'ok')
+        self.assertRaises(TypeError, f, 1)
+        self.assertRaises(TypeError, f, 1.5, 1, 2.5)
+        # Subclasses are allowed
+        self.assertEqual(f(True), 'ok')
+
+    def test_no_with_type_name(self):
+        from future.types import no
+        from future.types.newbytes import newbytes
+
+        @no('newbytes', (1, 2))
+        def g(self, a, b=None):
+            return 'ok'
+
+        self.assertEqual(g(None, b'abc', u'abc'), 'ok')
+        for i in range(2):
+            with self.assertRaises(TypeError) as cm:
+                g(None, u'abc', newbytes(b'abc'))
+            self.assertIn('newbytes', str(cm.exception))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
+import io
+import json
 import pprint
+import shutil
+import socket
+import sys
 import tempfile
 from subprocess import Popen, PIPE
 import os
 
 from libfuturize.fixer_util import is_shebang_comment, is_encoding_comment
+from libfuturize.fixes import lib2to3_fix_names_stage1
 from lib2to3.fixer_util import FromImport
 from lib2to3.pytree import Leaf, Node
 from lib2to3.pygram import token
@@ -14,6 +20,7 @@ from lib2to3.pygram import token
 from future.tests.base import (CodeHandler, unittest, skip26, reformat_code,
                                order_future_lines, expectedFailurePY26)
 from future.utils import PY2
+from future.moves.subprocess import check_output, CalledProcessError
 
 
 class TestLibFuturize(unittest.TestCase):
@@ -1429,5 +1436,336 @@ class TestFuturizeAllImports(CodeHandler):
         self.convert_check(before, after, all_imports=True, ignore_imports=False)
 
 
+class TestFuturizeCache(unittest.TestCase):
+    """
+    Tests for the on-disk result cache enabled with ``--cache-dir``.
+    """
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tempdir, 'cache')
+        self.filename = os.path.join(self.tempdir, 'mytestscript.py')
+        with open(self.filename, 'w') as f:
+            f.write("print 'Hello'\nd = {}\nif d.has_key('a'):\n    pass\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _refactor(self, fixers=sorted(lib2to3_fix_names_stage1), write=False):
+        from libfuturize.refactor import FuturizeRefactoringTool
+
+        class CountingRefactoringTool(FuturizeRefactoringTool):
+            parsed = []
+            def refactor_string(self, data, name):
+                self.parsed.append(name)
+                return super(CountingRefactoringTool,
+                             self).refactor_string(data, name)
+
+        rt = CountingRefactoringTool(fixers, {}, [], True, False,
+                                     cache_dir=self.cache_dir)
+        rt.refactor([self.filename], write)
+        return rt
+
+    def test_cache_hit_skips_parse(self):
+        rt1 = self._refactor()
+        rt2 = self._refactor()
+        self.assertEqual(rt1.parsed, [self.filename])
+        self.assertEqual(rt2.parsed, [])
+        self.assertEqual(rt2.files, [self.filename])
+        self.assertEqual(rt2.cache.hits, 1)
+
+    def test_cache_keyed_by_fixers(self):
+        self._refactor()
+        rt = self._refactor(fixers=['lib2to3.fixes.fix_has_key'])
+        self.assertEqual(rt.parsed, [self.filename])
+
+    def test_cache_replays_writes(self):
+        self._refactor()
+        rt = self._refactor(write=True)
+        self.assertEqual(rt.parsed, [])
+        self.assertTrue(rt.wrote)
+        with open(self.filename) as f:
+            self.assertIn("if 'a' in d:", f.read())
+        # The file contents have changed, so they must be parsed again:
+        rt = self._refactor()
+        self.assertEqual(rt.parsed, [self.filename])
+        self.assertEqual(rt.files, [])
+
+    def test_cache_dir_option(self):
+        from libfuturize.main import main
+        retcode = main(['--cache-dir', self.cache_dir, '--no-diffs',
+                        self.filename])
+        self.assertEqual(retcode, 0)
+        self.assertTrue(os.listdir(self.cache_dir))
+
+    def test_cache_keyed_by_path(self):
+        self._refactor()
+        other = os.path.join(self.tempdir, 'other.py')
+        shutil.copy(self.filename, other)
+        self.filename = other
+        rt = self._refactor()
+        self.assertEqual(rt.parsed, [other])
+        self.assertEqual(rt.files, [other])
+
+    def test_cache_keyed_by_sibling_modules(self):
+        """
+        fix_absolute_import looks for sibling modules, so the same file can
+        need different changes once a module is added next to it.
+        """
+        from libfuturize.main import main
+        pkg = os.path.join(self.tempdir, 'pkg')
+        os.mkdir(pkg)
+        filename = os.path.join(pkg, 'mod.py')
+        with open(os.path.join(pkg, '__init__.py'), 'w') as f:
+            f.write('')
+        for expected in ['import helper', 'from . import helper']:
+            with open(filename, 'w') as f:
+                f.write('import helper\n')
+            retcode = main(['--stage1', '--cache-dir', self.cache_dir, '-w',
+                            '-n', '--no-diffs', filename])
+            self.assertEqual(retcode, 0)
+            with open(filename) as f:
+                self.assertIn(expected + '\n', f.read())
+            self.assertTrue(os.listdir(self.cache_dir))
+            with open(os.path.join(pkg, 'helper.py'), 'w') as f:
+                f.write('')
+
+
+class TestFuturizeChangedFiles(unittest.TestCase):
+    """
+    Tests for restricting a run with ``--files-from`` and ``--changed-since``.
+    """
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.pkg = os.path.join(self.tempdir, 'pkg')
+        os.makedirs(os.path.join(self.pkg, '.hidden'))
+        for name in ['a.py', 'b.py', 'notes.txt', os.path.join('.hidden', 'c.py')]:
+            with open(os.path.join(self.pkg, name), 'w') as f:
+                f.write("print 'Hello'\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_restrict_paths(self):
+        from libfuturize.changes import restrict_paths
+        a = os.path.join(self.pkg, 'a.py')
+        b = os.path.join(self.pkg, 'b.py')
+        selected = [a, os.path.join(self.pkg, 'notes.txt'),
+                    os.path.join(self.pkg, '.hidden', 'c.py'),
+                    os.path.join(self.pkg, 'deleted.py')]
+        self.assertEqual(restrict_paths([self.pkg], selected), [a])
+        self.assertEqual(restrict_paths([self.pkg, a], selected), [a])
+        self.assertEqual(restrict_paths([b], selected), [])
+        self.assertEqual(restrict_paths([], [b]), [os.path.relpath(b)])
+
+    def test_select_files(self):
+        from optparse import Values
+        from libfuturize.changes import select_files
+        listing = os.path.join(self.tempdir, 'files.txt')
+        with open(listing, 'w') as f:
+            f.write(os.path.join(self.pkg, 'b.py') + '\n')
+        options = Values({'changed_since': None, 'files_from': None})
+        self.assertEqual(select_files(options, [self.pkg]), [self.pkg])
+        self.assertIsNone(select_files(options, []))
+        options.files_from = listing
+        self.assertEqual(select_files(options, [self.pkg]),
+                         [os.path.join(self.pkg, 'b.py')])
+        options.files_from = os.path.join(self.tempdir, 'no-such-file')
+        self.assertIsNone(select_files(options, [self.pkg]))
+
+    def test_files_from(self):
+        from libfuturize.main import main
+        listing = os.path.join(self.tempdir, 'files.txt')
+        with open(listing, 'w') as f:
+            f.write(os.path.join(self.pkg, 'a.py') + '\n')
+        retcode = main(['--files-from', listing, '-w', '-n', self.pkg])
+        self.assertEqual(retcode, 0)
+        with open(os.path.join(self.pkg, 'a.py')) as f:
+            self.assertEqual(f.read(), "from __future__ import print_function\nprint('Hello')\n")
+        with open(os.path.join(self.pkg, 'b.py')) as f:
+            self.assertEqual(f.read(), "print 'Hello'\n")
+
+    def test_changed_since(self):
+        from libfuturize.changes import git_changed_files
+        cwd = os.getcwd()
+        os.chdir(self.pkg)
+        try:
+            try:
+                check_output(['git', 'init', '-q'])
+            except OSError:
+                self.skipTest('git is not available')
+            check_output(['git', 'add', 'a.py', 'b.py'])
+            check_output(['git', '-c', 'user.name=test',
+                          '-c', 'user.email=test@example.com',
+                          'commit', '-q', '-m', 'initial'])
+            with open('b.py', 'a') as f:
+                f.write("print 'World'\n")
+            self.assertEqual(sorted(git_changed_files('HEAD')),
+                             ['.hidden/c.py', 'b.py', 'notes.txt'])
+            self.assertRaises(CalledProcessError, git_changed_files,
+                              'no-such-revision')
+        finally:
+            os.chdir(cwd)
+
+
+class TestFuturizeRefactoringTool(unittest.TestCase):
+    """
+    Tests that FuturizeRefactoringTool's tree walk gives the same results as
+    lib2to3's.
+    """
+    code = reformat_code("""
+    import urllib2, ConfigParser
+    class Foo:
+        def next(self):
+            return 1 / 2 <> 3L
+        def __nonzero__(self):
+            print >> sys.stderr, u'x', 0755
+    try:
+        d = dict((k, v) for k, v in x.iteritems() if k.has_key(1))
+    except IOError, e:
+        raise ValueError, e
+    exec "x = 1" in d
+    for i in xrange(10): print i
+    """)
+
+    def test_walks(self):
+        from libfuturize.refactor import _pre_order, _post_order, _leaves
+        from lib2to3.main import StdoutRefactoringTool
+        rt = StdoutRefactoringTool([], {}, [], True, False)
+        tree = rt.driver.parse_string(self.code)
+        self.assertEqual(list(_pre_order(tree)), list(tree.pre_order()))
+        self.assertEqual(list(_post_order(tree)), list(tree.post_order()))
+        self.assertEqual(list(_leaves(tree)), list(tree.leaves()))
+        leaf = next(tree.leaves())
+        self.assertEqual(list(_leaves(leaf)), [leaf])
+
+    def test_same_output_as_lib2to3(self):
+        from libfuturize.fixes import (lib2to3_fix_names_stage2,
+                                       libfuturize_fix_names_stage1,
+                                       libfuturize_fix_names_stage2)
+        from libfuturize.refactor import FuturizeRefactoringTool
+        from lib2to3.main import StdoutRefactoringTool
+        fixers = sorted(lib2to3_fix_names_stage1 | lib2to3_fix_names_stage2 |
+                        libfuturize_fix_names_stage1 |
+                        libfuturize_fix_names_stage2)
+        expected = StdoutRefactoringTool(fixers, {}, [], True, False)
+        rt = FuturizeRefactoringTool(fixers, {}, [], True, False)
+        self.assertEqual(str(rt.refactor_string(self.code, 'x')),
+                         str(expected.refactor_string(self.code, 'x')))
+
+    def test_process_pool(self):
+        """
+        With several processes, the results should be the same as with one,
+        and be reported in the same order.
+        """
+        from libfuturize.refactor import FuturizeRefactoringTool
+        tempdir = tempfile.mkdtemp()
+        try:
+            for name, code in [('a.py', self.code), ('b.py', "print 'x' 'y\n"),
+                               ('c.py', "x = 1\n"), ('d.py', "exec 'x'\n")]:
+                with open(os.path.join(tempdir, name), 'w') as f:
+                    f.write(code)
+            fixers = sorted(lib2to3_fix_names_stage1)
+            results = []
+            for processes in (1, 3):
+                rt = FuturizeRefactoringTool(fixers, {}, [], True, False)
+                rt.refactor([tempdir], False, False, processes)
+                results.append((rt.files, len(rt.errors), rt.fixer_log))
+            self.assertEqual(results[0], results[1])
+            self.assertEqual([os.path.basename(f) for f in results[1][0]],
+                             ['a.py', 'd.py'])
+            self.assertEqual(results[1][1], 1)
+        finally:
+            shutil.rmtree(tempdir)
+
+
+class TestFuturizeServer(unittest.TestCase):
+    """
+    Tests for running futurize requests in a long-lived server process.
+    """
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        with open(os.path.join(self.tempdir, 'mytestscript.py'), 'w') as f:
+            f.write("print 'Hello'\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_warm_tools_are_reused(self):
+        from libfuturize import refactor
+        saved = refactor._warm_tools
+        refactor._warm_tools = None
+        try:
+            refactor.keep_tools_warm()
+            fixers = ['lib2to3.fixes.fix_idioms', 'lib2to3.fixes.fix_ne']
+            rt1 = refactor.refactoring_tool(fixers, {}, [], False, True)
+            rt1.refactor_string("1 <> 2\n", 'x')
+            rt1.errors.append(('error', (), {}))
+            rt2 = refactor.refactoring_tool(fixers, {}, [], True, False,
+                                            output_dir='out')
+            self.assertIs(rt1, rt2)
+            self.assertEqual(rt2.errors, [])
+            self.assertTrue(rt2.nobackups)
+            self.assertEqual(rt2._output_dir, 'out')
+            rt3 = refactor.refactoring_tool(fixers[1:], {}, [], True, False)
+            self.assertIsNot(rt1, rt3)
+        finally:
+            refactor._warm_tools = saved
+
+    def test_run_request(self):
+        from libfuturize.server import _Output, _run
+        wfile = io.BytesIO()
+        output = _Output(wfile)
+        status = _run({'program': 'futurize', 'cwd': self.tempdir,
+                       'args': ['--stage1', 'mytestscript.py']}, output)
+        output.flush()
+        self.assertEqual(status, 0)
+        messages = [json.loads(line.decode('utf-8'))
+                    for line in wfile.getvalue().splitlines()]
+        stdout = ''.join(m.get('stdout', '') for m in messages)
+        stderr = ''.join(m.get('stderr', '') for m in messages)
+        self.assertIn("+print('Hello')", stdout)
+        self.assertIn("Refactored mytestscript.py", stderr)
+
+        output = _Output(io.BytesIO())
+        status = _run({'program': 'pasteurize', 'cwd': self.tempdir,
+                       'args': ['--no-such-option']}, output)
+        self.assertEqual(status, 2)
+
+    def test_no_server(self):
+        from libfuturize.client import run_client
+        address = os.path.join(self.tempdir, 'no-such-socket')
+        self.assertIsNone(run_client(address, 'futurize', ['x.py']))
+
+    def test_client_imports(self):
+        """
+        The scripts' entry points must not import lib2to3 or the fixers
+        before they know whether a server will run the request.
+        """
+        output = check_output([
+            sys.executable, '-c',
+            'import sys, libfuturize.client; '
+            'print(sorted(name for name in sys.modules if name.startswith('
+            '("lib2to3", "libfuturize.", "libpasteurize", "future."))))'])
+        self.assertEqual(output.strip(), b"['libfuturize.client']")
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'needs Unix sockets')
+    def test_running_server_is_kept(self):
+        from libfuturize.client import run_client
+        from libfuturize.server import serve
+        address = os.path.join(self.tempdir, 'futurize.sock')
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(address)
+            listener.listen(1)
+            self.assertEqual(serve(address), 1)
+            self.assertTrue(os.path.exists(address))
+            # Starting a server is never forwarded to a running one
+            for args in (['--server', 'other.sock'], ['--server=other.sock'],
+                         ['--serv', 'other.sock']):
+                self.assertIsNone(run_client(address, 'futurize', args))
+        finally:
+            listener.close()
+
+
 if __name__ == '__main__':
     unittest.main()
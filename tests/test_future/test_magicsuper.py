@@ -131,5 +131,71 @@ class TestMagicSuper(unittest.TestCase):
         self.assertEqual(Singleton.getit(), 43)
 
 
+class TestNewSuperOwnerCache(unittest.TestCase):
+    """
+    Tests for the caching of owner lookups in newsuper(). These use newsuper
+    directly, so that they also run on Py3.
+    """
+
+    def test_cached_owner_is_revalidated(self):
+        newsuper = future.builtins.newsuper.newsuper
+        class Base(object):
+            def calc(self):
+                return 1
+        class Sub(Base):
+            def calc(self):
+                return newsuper().calc() + 10
+        calc = Sub.calc
+        obj = Sub()
+        self.assertEqual(obj.calc(), 11)
+        self.assertEqual(obj.calc(), 11)
+        # Move the method to a new class between Sub and Base
+        class Middle(Base):
+            def calc(self):
+                return newsuper().calc() + 100
+        Middle.calc2 = calc
+        del Sub.calc
+        Sub.__bases__ = (Middle,)
+        # A stale owner (Sub) would give 111 here
+        self.assertEqual(obj.calc2(), 11)
+        self.assertEqual(obj.calc(), 101)
+
+    def test_cache_does_not_keep_classes_alive(self):
+        import gc
+        import weakref
+        newsuper = future.builtins.newsuper.newsuper
+        class Base(object):
+            def calc(self):
+                return 1
+        class Sub(Base):
+            def calc(self):
+                return newsuper().calc() + 1
+        self.assertEqual(Sub().calc(), 2)
+        ref = weakref.ref(Sub)
+        del Sub
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_classmethod_and_property(self):
+        newsuper = future.builtins.newsuper.newsuper
+        class Base(object):
+            @classmethod
+            def make(cls):
+                return 'base'
+            @property
+            def value(self):
+                return 1
+        class Sub(Base):
+            @classmethod
+            def make(cls):
+                return 'sub ' + newsuper().make()
+            @property
+            def value(self):
+                return newsuper().value + 1
+        for i in range(2):
+            self.assertEqual(Sub.make(), 'sub base')
+            self.assertEqual(Sub().value, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -185,6 +185,51 @@ class TestStandardLibraryReorganization(CodeHandler):
             self.assertEqual(len(meta_path), len(sys.meta_path) + 1)
             self.assertFalse(standard_library.detect_hooks())
 
+    def test_rename_import_finder(self):
+        """
+        RenameImport should only claim the new base names, and should reuse
+        modules that have already been imported rather than executing them
+        again.
+        """
+        import textwrap
+        renamer = standard_library.RenameImport(
+            {'textwrap': 'newtextwrap', 'xml.dom': 'newxml.dom'})
+        self.assertEqual(renamer.new_base_names,
+                         frozenset(['newtextwrap', 'newxml']))
+        self.assertIs(renamer.find_module('newtextwrap'), renamer)
+        self.assertIs(renamer.find_module('newxml'), renamer)
+        self.assertIsNone(renamer.find_module('textwrap'))
+        self.assertIsNone(renamer.find_module('newxml.dom'))
+        try:
+            self.assertIs(renamer.load_module('newtextwrap'), textwrap)
+            self.assertIs(sys.modules['newtextwrap'], textwrap)
+        finally:
+            sys.modules.pop('newtextwrap', None)
+
+    def test_lazy_module(self):
+        """
+        The stand-ins used by install_aliases(lazy=True) should import their
+        target on first use and then get out of the way.
+        """
+        import types
+        from future.standard_library import _LazyModule
+        parent = types.ModuleType('lazyparent')
+        stub = _LazyModule('lazyparent.wrap', 'textwrap')
+        parent.wrap = stub
+        sys.modules['lazyparent'] = parent
+        sys.modules['lazyparent.wrap'] = stub
+        try:
+            import textwrap
+            self.assertIs(stub.dedent, textwrap.dedent)
+            self.assertIs(sys.modules['lazyparent.wrap'], textwrap)
+            self.assertIs(parent.wrap, textwrap)
+            # References to the stand-in taken before the import still work
+            self.assertIs(stub.fill, textwrap.fill)
+            self.assertRaises(AttributeError, getattr, stub, 'nonexistent')
+        finally:
+            del sys.modules['lazyparent']
+            del sys.modules['lazyparent.wrap']
+
     @unittest.skipIf(utils.PY3, 'not testing for old urllib on Py3')
     def test_old_urllib_import(self):
         """
@@ -99,6 +99,17 @@ class TestStr(unittest.TestCase):
         self.assertFalse(hasattr(s, 'decode'))
         self.assertTrue(hasattr(s, 'encode'))
 
+    def test_newstr_hasattr_decode(self):
+        from future.types.newstr import newstr
+        s = newstr(u'abcd')
+        self.assertFalse(hasattr(s, 'decode'))
+        self.assertFalse(hasattr(newstr, 'decode'))
+        with self.assertRaises(AttributeError) as cm:
+            s.decode('utf-8')
+        self.assertIn('disabled in newstr', str(cm.exception))
+        self.assertEqual(s.encode('ascii'), b'abcd')
+        self.assertEqual(s.upper(), u'ABCD')
+
     def test_isinstance_str(self):
         self.assertTrue(isinstance(str('blah'), str))
 
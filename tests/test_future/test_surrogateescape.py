@@ -7,6 +7,7 @@ from __future__ import absolute_import, division, unicode_literals
 from future.builtins import (bytes, dict, int, range, round, str, super,
                              ascii, chr, hex, input, next, oct, open, pow,
                              filter, map, zip)
+from future.utils import native_str
 from future.utils.surrogateescape import register_surrogateescape
 from future.tests.base import unittest, expectedFailurePY26, expectedFailurePY2
 
@@ -138,5 +139,48 @@ class SurrogateEscapeTest(unittest.TestCase):
         self.assertEqual(s2, b6.decode('shift-jis', 'surrogateescape'))
 
 
+class PurePythonSurrogateEscapeTest(unittest.TestCase):
+    """
+    Tests for the pure-Python handler directly, since Py3 uses its own
+    """
+    def test_replace_surrogate_decode(self):
+        from future.utils import surrogateescape as se
+        self.assertEqual(se.replace_surrogate_decode(b'a\x80\xff'),
+                         'a\udc80\udcff')
+        self.assertEqual(se.replace_surrogate_decode(bytes(b'\xc3')),
+                         '\udcc3')
+
+    def test_replace_surrogate_encode(self):
+        from future.utils import surrogateescape as se
+        self.assertEqual(se.replace_surrogate_encode('\udc80\udcff\udc41'),
+                         '\x80\xffA')
+        for s in ['a\udc80', '\ud800', '\udd00']:
+            self.assertRaises(se.NotASurrogateError,
+                              se.replace_surrogate_encode, s)
+
+    def test_encodefilename(self):
+        from future.utils import surrogateescape as se
+        old_encoding = se.FS_ENCODING
+        try:
+            se.FS_ENCODING = native_str('ascii')
+            self.assertEqual(se.encodefilename('abc'), b'abc')
+            self.assertEqual(se.encodefilename('a\udcffb\udc80'),
+                             b'a\xffb\x80')
+            with self.assertRaises(UnicodeEncodeError) as cm:
+                se.encodefilename('ab\udcffc\xe9')
+            self.assertEqual(cm.exception.start, 4)
+
+            # A unicode encoding name must work too
+            se.FS_ENCODING = 'utf-8'
+            self.assertEqual(se.encodefilename('caf\xe9'), b'caf\xc3\xa9')
+            self.assertEqual(se.encodefilename('\xe9\udcff\udc80x\udcc3'),
+                             b'\xc3\xa9\xff\x80x\xc3')
+            with self.assertRaises(UnicodeEncodeError) as cm:
+                se.encodefilename('ab\udcffc\ud800')
+            self.assertEqual(cm.exception.start, 4)
+        finally:
+            se.FS_ENCODING = old_encoding
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -98,6 +98,33 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(d1, d2)
         self.assertEqual(type(d2), type({}))
 
+    def test_native_deep(self):
+        from future.utils import native_deep, _native_deep
+        from future.types.newdict import newdict
+        from future.types.newint import newint
+        from future.types.newlist import newlist
+        from future.types.newstr import newstr
+
+        data = {'a': [1, (2.0, None)], 'b': set([b'c']), 'd': frozenset()}
+        self.assertIs(native_deep(data), data)
+        self.assertIs(_native_deep(data), data)
+
+        data = {newstr(u'a'): newlist([newint(10), (1, newstr(u'c'))]),
+                'e': newdict({'f': set([newstr(u'g')])}),
+                'h': [1, 2]}
+        converted = _native_deep(data)
+        self.assertEqual(converted, data)
+        self.assertEqual([type(key) for key in converted], [type(u'')] * 3)
+        self.assertEqual(type(converted[u'a']), type([]))
+        self.assertEqual(type(converted[u'a'][0]), long if PY2 else int)
+        self.assertEqual(type(converted[u'a'][1][1]), type(u''))
+        self.assertEqual(type(converted['e']), type({}))
+        self.assertEqual(type(list(converted['e']['f'])[0]), type(u''))
+        # Containers with nothing to convert are not copied
+        self.assertIs(converted['h'], data['h'])
+        if PY3:
+            self.assertIs(native_deep(data), data)
+
     def test_istext(self):
         self.assertTrue(istext(self.s))
         self.assertTrue(istext(self.s2))
@@ -9,9 +9,11 @@ import os.path
 import sys
 import traceback
 from contextlib import contextmanager
+from functools import cmp_to_key
 
 from future.tests.base import unittest
 from future.utils import PY3, PY26
+from past.builtins.misc import sort_cmp
 
 if PY3:
     from past.builtins import cmp
@@ -48,6 +50,39 @@ class TestCmp(unittest.TestCase):
                                  "".format(x=x, y=y, past_cmp_value=past_cmp_value,
                                            cmp_python2_value=cmp_python2_value))
 
+    def test_sort_cmp(self):
+        nan = float('nan')
+        sequences = [
+            [],
+            [3, 1, 2, True, 0.5, -1.5],
+            ['b', 'a', 'c'],
+            [b'b', b'a'],
+            [2, nan, 1.5, 1],
+            [None, 2, 'a', [1], {'a': 1}, b'b', 1.5],
+            [[2], [1, 2], [1]],
+        ]
+        # On Py2, sort_cmp() is sorted(), which compares NaNs with < rather
+        # than with cmp()
+        sort_key = cmp_to_key(cmp) if PY3 else None
+        for values in sequences:
+            expected = sorted(values, key=sort_key)
+            result = sort_cmp(values)
+            self.assertEqual(list(map(repr, result)),
+                             list(map(repr, expected)))
+            expected = sorted(values, key=sort_key, reverse=True)
+            result = sort_cmp(values, reverse=True)
+            self.assertEqual(list(map(repr, result)),
+                             list(map(repr, expected)))
+
+    def test_sort_cmp_key(self):
+        words = ['bb', 'a', 'ccc', 'dd']
+        self.assertEqual(sort_cmp(words, key=len), ['a', 'bb', 'dd', 'ccc'])
+        self.assertEqual(sort_cmp(words, key=len, reverse=True),
+                         ['ccc', 'bb', 'dd', 'a'])
+        pairs = [(1, None), (0, 'a'), (1, 2)]
+        self.assertEqual(sort_cmp(pairs, key=lambda pair: pair[1]),
+                         [(1, None), (1, 2), (0, 'a')])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -29,6 +29,60 @@ class TestNonIterators(unittest.TestCase):
         self.assertEqual(l4, [1, 3, 5, 7, 9])
         self.assertTrue(isinstance(l4, list))
 
+    def test_map_does_not_flatten_results(self):
+        self.assertEqual(map(lambda x: (x,), [1, 2]), [(1,), (2,)])
+        self.assertEqual(map(None, [(1,), (2,)]), [(1,), (2,)])
+        self.assertEqual(map(None, iter([1, 2])), [1, 2])
+        self.assertRaises(TypeError, map, None)
+
+
+@unittest.skipIf(utils.PY2, 'the lazy functions are the builtins on Py2')
+class TestLazyList(unittest.TestCase):
+
+    def test_lazy_functions(self):
+        from past.builtins.noniterators import (lazylist, lazymap,
+                                                lazyfilter, lazyzip)
+        calls = []
+        def double(x):
+            calls.append(x)
+            return x * 2
+
+        l = lazymap(double, range(10))
+        self.assertTrue(isinstance(l, lazylist))
+        self.assertEqual(calls, [])
+        self.assertEqual(l[2], 4)
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertTrue(6 in l)
+        self.assertEqual(calls, [0, 1, 2, 3])
+        self.assertEqual(l, map(double, range(10)))
+        self.assertEqual(len(calls), 10 + 10)
+        self.assertEqual(lazymap(None, 'ab', 'c'), [('a', 'c'), ('b', None)])
+        self.assertEqual(lazyfilter(None, [0, 1, '', 'a']), [1, 'a'])
+        self.assertEqual(lazyzip('ab', 'cde'), zip('ab', 'cde'))
+
+    def test_lazylist_behaves_as_list(self):
+        from past.builtins.noniterators import lazylist
+        l = lazylist(iter([3, 1, 2]))
+        self.assertTrue(l)
+        self.assertFalse(lazylist(iter([])))
+        self.assertEqual(list(l), [3, 1, 2])
+        self.assertEqual(len(l), 3)
+        self.assertEqual(l[-1], 2)
+        self.assertEqual(l[1:], [1, 2])
+        self.assertEqual(l + [4], [3, 1, 2, 4])
+        self.assertEqual([0] + l, [0, 3, 1, 2])
+        self.assertEqual(l * 2, [3, 1, 2, 3, 1, 2])
+        self.assertEqual(repr(l), '[3, 1, 2]')
+        self.assertTrue(l < [4])
+        l.append(0)
+        l.sort()
+        self.assertEqual(l, [0, 1, 2, 3])
+        l[0] = 5
+        del l[1]
+        self.assertEqual(l, lazylist([5, 2, 3]))
+        self.assertEqual(l.index(3), 2)
+        self.assertRaises(TypeError, hash, l)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,6 +7,7 @@ from __future__ import absolute_import, unicode_literals, print_function
 
 from numbers import Integral
 from future.tests.base import unittest
+from future.utils import PY2
 from past.builtins import str as oldstr
 from past.types.oldstr import unescape
 
@@ -23,6 +24,15 @@ class TestOldStr(unittest.TestCase):
         self.assertEqual(str(s1), 'abc')
         s2 = oldstr(b'abc\ndef')
         self.assertEqual(str(s2), 'abc\ndef')
+        s3 = oldstr(b'it\'s "quoted"')
+        self.assertEqual(str(s3), 'it\'s "quoted"')
+
+    @unittest.skipIf(PY2, 'oldstr is the native str on Py2')
+    def test_str_matches_unescaped_repr(self):
+        data = bytes(bytearray(range(256)))
+        s = oldstr(data)
+        self.assertEqual(str(s), unescape(repr(data)[2:-1]))
+        self.assertEqual(len(str(s)), 256)
 
     def test_unescape(self):
         self.assertEqual(unescape('abc\\ndef'), 'abc\ndef')
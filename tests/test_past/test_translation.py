@@ -173,6 +173,236 @@ class TestTranslate(unittest.TestCase):
         module = self.write_and_import(code, 'py2_exceptions')
         self.assertEqual(module.value, 'string: success!')
 
+    @unittest.skipIf(sys.version_info < (3, 5), 'needs importlib.util.cache_from_source')
+    def test_translation_cache(self):
+        """
+        A second import of an unchanged module should reuse the cached
+        translation instead of running the fixers again.
+        """
+        import past.translation
+        code = """
+        print 'Hello'
+        value = 10L
+        """
+        dont_write_bytecode = sys.dont_write_bytecode
+        sys.dont_write_bytecode = False
+        try:
+            module = self.write_and_import(code, 'cached_translation')
+        finally:
+            sys.dont_write_bytecode = dont_write_bytecode
+        self.assertEqual(module.value, 10)
+        cache_dir = os.path.join(self.tempdir, '__pycache__')
+        self.assertTrue(any(name.startswith('cached_translation.') and
+                            '.opt-past.' in name
+                            for name in os.listdir(cache_dir)))
+        del sys.modules['cached_translation']
+
+        def fail(source, pathname):
+            raise AssertionError('the cached translation was not used')
+        saved = past.translation.transform
+        past.translation.transform = fail
+        try:
+            module = self.write_and_import(code, 'cached_translation')
+            self.assertEqual(module.value, 10)
+            del sys.modules['cached_translation']
+            # Changing the source invalidates the cache:
+            self.assertRaises(AssertionError, self.write_and_import,
+                              code + "value = 20L\n", 'cached_translation')
+        finally:
+            past.translation.transform = saved
+            sys.modules.pop('cached_translation', None)
+
+    def test_py3_module_not_translated(self):
+        """
+        Modules using Py3-only syntax should be imported without being
+        parsed or translated.
+        """
+        import past.translation
+        code = """
+        def outer():
+            total = 0
+            def add(n) -> None:
+                nonlocal total
+                total += n
+            add(3)
+            return total
+        x = 3 / 2
+        """
+
+        def fail(source, pathname):
+            raise AssertionError('Py3 code was translated')
+        saved = past.translation.transform
+        past.translation.transform = fail
+        try:
+            module = self.write_and_import(code, 'py3_module')
+        finally:
+            past.translation.transform = saved
+        self.assertEqual(module.x, 1.5)
+        self.assertEqual(module.outer(), 3)
+
+    @unittest.skipIf(sys.version_info < (3, 5), 'needs importlib.util.cache_from_source')
+    def test_cache_per_optimization_level(self):
+        """
+        Bytecode cached by a normal run must not be used under -O, and vice
+        versa, since -O strips assert statements.
+        """
+        import subprocess
+        with io.open(self.tempdir + 'asserting.py', 'w') as f:
+            f.write(u"value = 1L\nchecked = True\ntry:\n    assert False\n"
+                    u"except AssertionError:\n    checked = False\n"
+                    u"print(checked)\n")
+        script = ('import sys; sys.path.insert(0, %r); '
+                  'from past.translation import install_hooks; '
+                  'install_hooks("asserting"); import asserting' % self.tempdir)
+        env = dict(os.environ)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        env.pop('PYTHONOPTIMIZE', None)
+        for flags in [[], ['-O'], []]:
+            output = subprocess.check_output(
+                [sys.executable] + flags + ['-c', script], env=env)
+            self.assertEqual(output.strip(), b'True' if flags else b'False')
+
+    @unittest.skipIf(sys.version_info < (3, 5), 'needs importlib.util.cache_from_source')
+    def test_pretranslate(self):
+        """
+        pretranslate() should fill the translation cache for all modules in
+        a package, so that importing them does not run the fixers.
+        """
+        import past.translation
+        from past.translation import pretranslate
+        pkgdir = os.path.join(self.tempdir, 'pretranslated')
+        os.makedirs(os.path.join(pkgdir, 'sub'))
+        files = {'__init__.py': "",
+                 'a.py': "print 'a'\nvalue = 10L\n",
+                 'sub/__init__.py': "",
+                 'sub/b.py': "value = 20L\n",
+                 'skipped.py': "value = 30L\n"}
+        for name, code in files.items():
+            with io.open(os.path.join(pkgdir, name), 'w') as f:
+                f.write(code)
+        sys.path.insert(0, self.tempdir)
+        try:
+            translated = pretranslate(['pretranslated'], workers=2,
+                                      exclude_paths=['pretranslated.skipped'])
+        finally:
+            sys.path.remove(self.tempdir)
+        self.assertEqual(sorted(os.path.relpath(path, pkgdir)
+                                for path in translated),
+                         sorted(name for name in files if name != 'skipped.py'))
+        self.assertFalse(os.path.exists(past.translation._translation_cache_path(
+            os.path.join(pkgdir, 'skipped.py'))))
+
+        def fail(source, pathname):
+            raise AssertionError('the cached translation was not used')
+        saved = past.translation.transform
+        past.translation.transform = fail
+        install_hooks('pretranslated')
+        sys.path.insert(0, self.tempdir)
+        try:
+            import pretranslated.a
+            import pretranslated.sub.b
+            self.assertEqual(pretranslated.a.value, 10)
+            self.assertEqual(pretranslated.sub.b.value, 20)
+        finally:
+            past.translation.transform = saved
+            remove_hooks()
+            sys.path.remove(self.tempdir)
+            for name in list(sys.modules):
+                if name.startswith('pretranslated'):
+                    del sys.modules[name]
+
+    def test_stats(self):
+        from past.translation import print_stats, reset_stats, stats
+        reset_stats()
+        module = self.write_and_import("print 'timed'\nvalue = 1L\n",
+                                       'timed_module')
+        self.assertEqual(module.value, 1)
+        record = stats()['timed_module']
+        self.assertFalse(record['cached'])
+        for phase in ['find_spec', 'detect', 'transform', 'compile', 'exec']:
+            self.assertTrue(record[phase] > 0, phase)
+        f = io.StringIO()
+        print_stats(file=f)
+        lines = f.getvalue().splitlines()
+        self.assertTrue(lines[2].startswith('timed_module '))
+        self.assertEqual(len(lines[2].split()), 8)
+        reset_stats()
+        self.assertEqual(stats(), {})
+
+    def test_path_filter(self):
+        from past.translation import _PathFilter
+        path_filter = _PathFilter(['plotrique', 'mypkg.sub', 'x'],
+                                  ['plotrique.tests', 'xml'])
+        for fullname, expected in [('plotrique', True),
+                                   ('plotrique.plotting', True),
+                                   ('plotriquex', True),
+                                   ('plotrique.tests', False),
+                                   ('plotrique.tests.test_a', False),
+                                   ('mypkg', False),
+                                   ('mypkg.sub.mod', True),
+                                   ('xlrd', True),
+                                   ('xml.dom', False),
+                                   ('os', False)]:
+            self.assertEqual(path_filter.convert_needed(fullname), expected,
+                             fullname)
+            self.assertEqual(path_filter.convert_needed(fullname), expected,
+                             fullname)
+        self.assertFalse(_PathFilter([], []).convert_needed('os'))
+        self.assertTrue(_PathFilter([''], []).convert_needed('os'))
+
+    def test_find_spec_ignores_other_modules(self):
+        from past.translation import Py2Fixer
+        hook = Py2Fixer()
+        hook.include(['mypy2pkg'])
+        self.assertIsNone(hook.find_spec('textwrap'))
+        hook.include(['textwrap'])
+        spec = hook.find_spec('textwrap')
+        self.assertEqual(type(spec.loader).__name__, 'PastSourceFileLoader')
+        hook.exclude(['text'])
+        self.assertIsNone(hook.find_spec('textwrap'))
+
+    def test_is_obviously_py3(self):
+        from past.translation import detect_python2, is_obviously_py3
+        for code in ["async def f():\n    pass\n",
+                     "def f():\n    yield from g()\n",
+                     "def f(a) -> int:\n    pass\n"]:
+            self.assertTrue(is_obviously_py3(code), code)
+            self.assertFalse(detect_python2(code, '<test>'), code)
+        for code in ["print 'x'\n",
+                     "x = `1`\n",
+                     "async = 1\nprint 'yield', async\n"]:
+            self.assertFalse(is_obviously_py3(code), code)
+            self.assertTrue(detect_python2(code, '<test>'), code)
+        for code in ["x = 1\n", "s = 'f\"{x}\" -> y'  # nonlocal\n"]:
+            self.assertFalse(is_obviously_py3(code), code)
+            self.assertFalse(detect_python2(code, '<test>'), code)
+
+    @unittest.skipIf(sys.version_info < (3, 6), 'f-strings need Python 3.6')
+    def test_is_obviously_py3_fstring(self):
+        from past.translation import detect_python2, is_obviously_py3
+        for code in ["s = f'{x}'\n", "s = rf'{x}'\n"]:
+            self.assertTrue(is_obviously_py3(code), code)
+            self.assertFalse(detect_python2(code, '<test>'), code)
+
+    @unittest.skipIf(sys.version_info < (3, 8), ':= needs Python 3.8')
+    def test_is_obviously_py3_walrus(self):
+        from past.translation import detect_python2, is_obviously_py3
+        code = "if (n := 10) > 5:\n    pass\n"
+        self.assertTrue(is_obviously_py3(code))
+        self.assertFalse(detect_python2(code, '<test>'))
+
+    def test_translate(self):
+        from past.translation import translate
+        code = "def f(a) -> int:\n    print 'x'\n"
+        record = {}
+        self.assertEqual(translate(code, '<test>', record), code)
+        self.assertEqual(sorted(record), ['detect'])
+        record = {}
+        output = translate("print 'x'\n", '<test>', record)
+        self.assertIn("print('x')", output)
+        self.assertEqual(sorted(record), ['detect', 'transform'])
+        self.assertEqual(translate("x = 1\n", '<test>'), "x = 1\n")
+
 
 # class TestFuturizeSimple(CodeHandler):
 #     """